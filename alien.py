@@ -1,4 +1,3 @@
-import pygame
 from pygame.sprite import Sprite
 from typing import TYPE_CHECKING
 
@@ -6,34 +5,23 @@ if TYPE_CHECKING:
     from alien_fleet import AlienFleet
 
 class Alien(Sprite):
+    # Sprite.__init__ only sets the mangled group dict, so with every
+    # attribute slotted no per-instance __dict__ is ever allocated
+    __slots__ = ('_Sprite__g', 'fleet', 'rect')
+
     def __init__(self, fleet: 'AlienFleet', x: float, y: float):
         super().__init__()
 
         self.fleet = fleet
-        self.screen = fleet.game.screen
-        self.boundaries = fleet.game.screen.get_rect()
-        self.settings = fleet.game.settings
+        self.rect = fleet.image.get_rect()
+        self.reset(x, y)
+
+    @property
+    def image(self):
+        # one scaled image per fleet, shared by every alien
+        return self.fleet.image
 
-        self.image = pygame.image.load(str(self.settings.alien_file))
-        self.image = pygame.transform.scale(self.image,
-                (self.settings.alien_w, self.settings.alien_h)
-                )
-        self.rect = self.image.get_rect()
+    def reset(self, x: float, y: float):
+        # rect is the formation slot; AlienFleet adds the shared fleet offset
         self.rect.x = x
         self.rect.y = y
-
-        self.y = float(self.rect.y)
-        self.x = float(self.rect.x)
-
-    def update(self):
-        temp_speed = self.settings.fleet_speed
-
-        self.x += temp_speed * self.fleet.fleet_direction
-        self.rect.x = self.x
-        self.rect.y = self.y
-
-    def check_edges(self):
-        return (self.rect.right >= self.boundaries.right or self.rect.left <= self.boundaries.left)
-
-    def draw_alien(self):
-        self.screen.blit(self.image, self.rect)
\ No newline at end of file
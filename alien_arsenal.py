@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+    from alien_fleet import AlienFleet
+
+# spreads consecutive shots across the fleet without a random generator,
+# so a snapshot of (timer, shots) is enough to replay the same volleys
+SHOOTER_STEP = 0.6180339887498949
+
+
+class AlienArsenal:
+    # enemy shots live in preallocated arrays, packed into [0, count)
+
+    def __init__(self, game: 'AlienInvasion'):
+        self.game = game
+        self.settings = game.settings
+        capacity = self.settings.alien_bullet_capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity, dtype=int)
+        self.count = 0
+        self.timer = 0.0
+        self.shots = 0
+        self.dropped = 0
+
+        self.w, self.h = self.settings.alien_bullet_w, self.settings.alien_bullet_h
+        image = game.assets.image(self.settings.bullet_file, (self.w, self.h))
+        # the player's laser, pointed down
+        self.image = pygame.transform.flip(image, False, True)
+
+    def reset(self):
+        self.count = 0
+        self.timer = 0.0
+
+    def update(self, dt, fleet: 'AlienFleet'):
+        n = self.count
+        self.prev_y[:n] = np.floor(self.y[:n] + 0.5)
+        self.y[:n] += self.settings.alien_bullet_speed * dt
+        self._remove_bullets_offscreen()
+        self._fire(dt, fleet)
+
+    def _fire(self, dt, fleet: 'AlienFleet'):
+        rate = min(self.settings.alien_fire_rate, self.settings.alien_fire_rate_max)
+        if rate <= 0:
+            return
+        self.timer += dt
+        interval = 1 / rate
+        due = int(self.timer // interval)
+        if not due or not len(fleet):
+            return
+        self.timer -= due * interval
+
+        positions = np.asarray(fleet.alien_positions(), dtype=float).reshape(-1, 2)
+        shots = self.shots + np.arange(due)
+        self.shots += due
+        shooters = positions[(shots * SHOOTER_STEP % 1 * len(positions)).astype(int)]
+
+        start = self.count
+        room = min(due, len(self.x) - start)
+        self.dropped += due - room
+        end = start + room
+        self.x[start:end] = shooters[:room, 0] + (self.settings.alien_w - self.w) / 2
+        self.y[start:end] = shooters[:room, 1] + self.settings.alien_h
+        self.prev_y[start:end] = np.floor(self.y[start:end] + 0.5)
+        self.count = end
+
+    def _remove_bullets_offscreen(self):
+        n = self.count
+        keep = self.y[:n] < self.settings.screen_h
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        # compact the survivors to the front of the buffers
+        self.x[:kept] = self.x[:n][keep]
+        self.y[:kept] = self.y[:n][keep]
+        self.prev_y[:kept] = self.prev_y[:n][keep]
+        self.count = kept
+
+    def _rects(self):
+        # rounded the same way Sprite rects are
+        n = self.count
+        return (np.floor(self.x[:n] + 0.5).astype(int),
+                np.floor(self.y[:n] + 0.5).astype(int))
+
+    def collides_with(self, sprite):
+        if not self.count:
+            return False
+        rect = sprite.rect
+        left, top = self._rects()
+        hits = ((left < rect.right) & (left + self.w > rect.left)
+                & (top < rect.bottom) & (top + self.h > rect.top))
+        return bool(hits.any())
+
+    def draw(self):
+        if not self.count:
+            return
+        left, top = self._rects()
+        alpha = self.game.renderer.alpha
+        if alpha is not None:
+            prev_y = self.prev_y[:self.count]
+            top = np.rint(prev_y + (top - prev_y) * alpha).astype(int)
+        image = self.image
+        self.game.renderer.blits(
+            [(image, pos) for pos in zip(left.tolist(), top.tolist())])
+
+    def __len__(self):
+        return self.count
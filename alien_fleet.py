@@ -1,5 +1,8 @@
+import math
 import pygame
+import formations
 from alien import Alien
+from spatial_hash import SpatialHash
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,28 +16,112 @@ class AlienFleet:
         self.fleet = pygame.sprite.Group()
         self.fleet_direction = self.settings.fleet_direction
         self.fleet_drop_speed = self.settings.fleet_drop_speed
+        self.grid = None
+        if self.settings.collision_broadphase == 'spatial_hash':
+            self.grid = SpatialHash(self.settings.alien_w, self.settings.alien_h)
+        self._layouts = {}
+        self._pool = []
+        self._pool_size = None
+        self.image = None
+        # the fleet moves rigidly: aliens keep formation-space rects and
+        # share this offset; bounds are the live aliens' extents
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.prev_offset = (0, 0)
+        self.bounds = None
+        self.arsenal = None
+        if self.settings.alien_fire:
+            # numpy is only needed once the aliens shoot back
+            from alien_arsenal import AlienArsenal
+            self.arsenal = AlienArsenal(game)
 
         self.create_fleet()
     
     def create_fleet(self):
-        alien_w = self.settings.alien_w
-        alien_h = self.settings.alien_h
-        screen_w = self.settings.screen_w
-        screen_h = self.settings.screen_h
-
-        fleet_w, fleet_h = self.calculate_fleet_size(alien_w, screen_w, alien_h, screen_h)
-        x_offset, y_offset = self.calculate_offsets(alien_w, alien_h, screen_w, fleet_w, fleet_h)
-
-        self._create_rectangle_fleet(alien_w, alien_h, fleet_w, fleet_h, x_offset, y_offset)
+        self._populate(self.fleet_layout())
+        self.offset_x = self.offset_y = 0.0
+        self.prev_offset = (0, 0)
+        self._update_bounds()
+
+    def _populate(self, positions):
+        self.fleet.empty()
+        if self.grid is not None:
+            self.grid.clear()
+        for alien, (current_x, current_y) in zip(self._alien_pool(len(positions)), positions):
+            alien.reset(current_x, current_y)
+            self.fleet.add(alien)
+            if self.grid is not None:
+                self.grid.insert(alien)
+
+    def export_positions(self):
+        # formation-space slots of the live aliens as flat x, y pairs
+        return [coord for alien in self.fleet for coord in (alien.rect.x, alien.rect.y)]
+
+    def restore_positions(self, positions, offset_x, offset_y, prev_offset):
+        self._populate(list(zip(positions[::2], positions[1::2])))
+        self.offset_x, self.offset_y = offset_x, offset_y
+        self.prev_offset = prev_offset
+        self._update_bounds()
+
+    def _update_bounds(self):
+        # only rescanned when the set of live aliens changes
+        if not self.fleet:
+            self.bounds = None
+            return
+        rects = [alien.rect for alien in self.fleet]
+        self.bounds = (min(rect.left for rect in rects),
+                       max(rect.right for rect in rects),
+                       max(rect.bottom for rect in rects))
+
+    def offset(self):
+        # rounded the same way pygame rounds float rect coordinates
+        return math.floor(self.offset_x + 0.5), math.floor(self.offset_y + 0.5)
+
+    def _layout_key(self):
+        # the formation only depends on the screen and alien size
+        key = (self.settings.screen_w, self.settings.screen_h,
+               self.settings.alien_w, self.settings.alien_h)
+        if self.settings.stress_mode:
+            key += (self.settings.stress_formation, self.settings.stress_alien_count,
+                    self.settings.stress_seed)
+        return key
+
+    def fleet_layout(self):
+        key = self._layout_key()
+        screen_w, screen_h, alien_w, alien_h = key[:4]
+        layout = self._layouts.get(key)
+        if layout is None and self.settings.stress_mode:
+            layout = self._layouts[key] = formations.generate(self.settings)
+        elif layout is None:
+            fleet_w, fleet_h = self.calculate_fleet_size(alien_w, screen_w, alien_h, screen_h)
+            x_offset, y_offset = self.calculate_offsets(alien_w, alien_h, screen_w, fleet_w, fleet_h)
+            layout = self._create_rectangle_fleet(alien_w, alien_h, fleet_w, fleet_h,
+                x_offset, y_offset)
+            self._layouts[key] = layout
+        return layout
 
     def _create_rectangle_fleet(self, alien_w, alien_h, fleet_w, fleet_h, x_offset, y_offset):
+        positions = []
         for row in range(fleet_h):
             for col in range(fleet_w):
                 current_x = alien_w * col + x_offset
                 current_y = alien_h * row + y_offset
                 if col % 2 == 0 or row % 2 == 0:
                     continue
-                self._create_alien(current_x, current_y)
+                positions.append((current_x, current_y))
+        return positions
+
+    def _alien_pool(self, count):
+        # aliens are revived between waves and restores rather than rebuilt
+        size = (self.settings.alien_w, self.settings.alien_h)
+        if size != self._pool_size:
+            self.image = self.game.assets.image(self.settings.alien_file, size)
+            self._pool = []
+            self._pool_size = size
+        missing = count - len(self._pool)
+        if missing > 0:
+            self._pool.extend(Alien(self, 0, 0) for _ in range(missing))
+        return self._pool
 
     def calculate_offsets(self, alien_w, alien_h, screen_w, fleet_w, fleet_h):
         half_screen = self.settings.screen_h//2
@@ -60,41 +147,97 @@ class AlienFleet:
 
         return int(fleet_w), int(fleet_h)
         
-    def _create_alien(self, current_x: int, current_y: int):
-        new_alien = Alien(self, current_x, current_y)
-
-        self.fleet.add(new_alien)
-
     def _check_fleet_edges(self):
-        alien: Alien
-        for alien in self.fleet:
-            if alien.check_edges():
-                self._drop_alien_fleet()
-                self.fleet_direction *= -1
-                break
+        if self.bounds is None:
+            return
+        dx, _ = self.offset()
+        left, right, _ = self.bounds
+        boundaries = self.game.screen.get_rect()
+        if right + dx >= boundaries.right or left + dx <= boundaries.left:
+            self._drop_alien_fleet()
+            self.fleet_direction *= -1
         
     def _drop_alien_fleet(self):
-        for alien in self.fleet:
-            alien.y += self.fleet_drop_speed
+        self.offset_y += self.fleet_drop_speed
 
-    def update_fleet(self):
+    def update_fleet(self, dt):
+        self.prev_offset = self.offset()
         self._check_fleet_edges()
-        self.fleet.update()
+        self.offset_x += self.settings.fleet_speed * dt * self.fleet_direction
+        if self.arsenal is not None:
+            self.arsenal.update(dt, self)
 
     def draw(self):
-        alien: 'Alien'
-        for alien in self.fleet:
-            alien.draw_alien()
+        dx, dy = self.offset()
+        alpha = self.game.renderer.alpha
+        if alpha is not None:
+            prev_x, prev_y = self.prev_offset
+            dx = round(prev_x + (dx - prev_x) * alpha)
+            dy = round(prev_y + (dy - prev_y) * alpha)
+        image = self.image
+        self.game.renderer.blits(
+            [(image, (alien.rect.x + dx, alien.rect.y + dy)) for alien in self.fleet])
+        if self.arsenal is not None:
+            self.arsenal.draw()
+
+    def _collided(self):
+        # tests a screen-space rect against formation-space alien rects
+        dx, dy = self.offset()
+        return lambda alien, other: alien.rect.colliderect(other.rect.move(-dx, -dy))
 
     def check_collisions(self, other_group):
-        return pygame.sprite.groupcollide(self.fleet, other_group, True, True)
+        if self.grid is None:
+            collisions = pygame.sprite.groupcollide(self.fleet, other_group, True, True,
+                self._collided())
+        else:
+            collisions = self._check_grid_collisions(other_group)
+        if collisions:
+            self._update_bounds()
+        return collisions
+
+    def _check_grid_collisions(self, other_group):
+        # same result as groupcollide: each bullet goes to the first alien
+        # in fleet order that it overlaps
+        order = self.grid.order.__getitem__
+        dx, dy = self.offset()
+        claimed = {}
+        for bullet in other_group:
+            hits = self.grid.query(bullet.rect.move(-dx, -dy))
+            if hits:
+                alien = min(hits, key=order)
+                claimed.setdefault(alien, []).append(bullet)
+
+        collisions = {alien: claimed[alien] for alien in sorted(claimed, key=order)}
+        for alien, bullets in collisions.items():
+            self.grid.remove(alien)
+            alien.kill()
+            for bullet in bullets:
+                bullet.kill()
+        return collisions
+
+    def collides_with(self, sprite):
+        dx, dy = self.offset()
+        local = sprite.rect.move(-dx, -dy)
+        if self.grid is None:
+            return any(alien.rect.colliderect(local) for alien in self.fleet)
+        return bool(self.grid.query(local))
+
+    def reset_fleet(self):
+        if self.arsenal is not None:
+            self.arsenal.reset()
+        self.create_fleet()
     
     def check_fleet_bottom(self):
-        alien: Alien
-        for alien in self.fleet:
-            if alien.rect.bottom >= self.settings.screen_h:
-                return True
-        return False
+        if self.bounds is None:
+            return False
+        return self.bounds[2] + self.offset()[1] >= self.settings.screen_h
     
     def check_destroyed_status(self):
-        return not self.fleet
\ No newline at end of file
+        return not self.fleet
+
+    def alien_positions(self):
+        dx, dy = self.offset()
+        return [(alien.rect.x + dx, alien.rect.y + dy) for alien in self.fleet]
+
+    def __len__(self):
+        return len(self.fleet)
@@ -1,4 +1,6 @@
+import os
 import sys
+from time import perf_counter
 import pygame
 from settings import Settings
 from ship import Ship
@@ -6,72 +8,210 @@ from arsenal import Arsenal
 #from alien import Alien
 from alien_fleet import AlienFleet
 from game_stats import GameStats
-from time import sleep
 from button import Button
 from hud import HUD
+from asset_cache import AssetCache
+from renderer import Renderer
+from glyph_cache import GlyphCache
+from game_state import GameState
+from profiler import FrameProfiler, timed
+from preloader import Preloader
+from audio import AudioManager, NullAudio
+from atlas import TextureAtlas
 
 class AlienInvasion:
 
-    def __init__(self):
-        pygame.init()
-        self.settings = Settings()
+    def __init__(self, settings: Settings = None, parent: 'AlienInvasion' = None):
+        self.settings = settings or Settings()
+        if self.settings.headless:
+            # no window, no sound card and no frame cap
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            self.settings.FPS = 0
+            # simulations never touch the player's saved scores
+            self.settings.persist_scores = False
+            if self.settings.audio_backend is None:
+                self.settings.audio_backend = 'null'
+        # only what the Play screen needs; audio comes up on the preloader
+        pygame.display.init()
+        pygame.font.init()
         self.settings.initialize__dynamic_settings()
+        if self.settings.audio_backend == 'null':
+            self.audio = NullAudio()
+        else:
+            self.audio = AudioManager(self.settings)
+        self.preloader = Preloader()
+        if parent is None:
+            self.assets = AssetCache()
+            # the background PNG is the slowest asset to decode, so it
+            # loads on the preloader and the Play screen starts on a fill
+            self.bg = None
+            self.preloader.submit('background', self.assets.decode, self.settings.bg_file,
+                (self.settings.screen_w, self.settings.screen_h))
+        else:
+            # forks reuse everything their parent already decoded
+            self.assets = parent.assets
+            self.bg = parent.bg
+        self.preloader.submit('sounds', self.audio.load)
+        self.audio_ready = False
 
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_w, self.settings.screen_h)
-            )
-        pygame.display.set_caption(self.settings.name)
+        if parent is None:
+            self.screen = pygame.display.set_mode(
+                (self.settings.screen_w, self.settings.screen_h)
+                )
+            pygame.display.set_caption(self.settings.name)
+            self.assets.sync(self.settings)
+            if self.settings.use_atlas:
+                self.assets.use_atlas(TextureAtlas.for_settings(self.settings).load())
+            self.glyphs = GlyphCache()
+        else:
+            # a surface of its own, so forks never draw over each other
+            self.screen = pygame.Surface(parent.screen.get_size(), 0, parent.screen)
+            self.glyphs = parent.glyphs
         
-        self.bg = pygame.image.load(self.settings.bg_file)
-        self.bg = pygame.transform.scale(self.bg,
-            (self.settings.screen_w, self.settings.screen_h)
-            )
+        self.renderer = Renderer(self)
 
         self.game_stats = GameStats(self)
         self.HUD = HUD(self)
         self.running = True
         self.clock = pygame.time.Clock()
-
-        pygame.mixer.init()
-        self.laser_sound = pygame.mixer.Sound(self.settings.laser_sound)
-        self.laser_sound.set_volume(0.7)
-
-        self.impact_sound = pygame.mixer.Sound(self.settings.impact_sound)
-        self.impact_sound.set_volume(0.7)
+        self.accumulator = 0.0
+        self.skipped_renders = 0
+        self.auto_fire_timer = 0.0
+        self.recorder = None
 
         self.ship = Ship(self, Arsenal(self))
-        self.alien_fleet = AlienFleet(self)
-        self.alien_fleet.create_fleet()
+        self.alien_fleet = self._create_alien_fleet()
         
         self.play_button = Button(self, 'Play')
-        self.game_active = False
+        self.state = GameState(self)
+        self.profiler = FrameProfiler(self) if self.settings.profiler else None
+
+    def _wait_for_assets(self):
+        if not self.audio_ready:
+            self.preloader.result('sounds')
+            self.audio_ready = True
+        if self.bg is None and 'background' in self.preloader.done:
+            self.preloader.result('background')
+            self._check_background()
+
+    def _check_background(self):
+        if (self.bg is None and 'background' in self.preloader.done
+                and self.preloader.ready('background')):
+            self.bg = self.assets.add(self.settings.bg_file,
+                (self.settings.screen_w, self.settings.screen_h),
+                self.preloader.result('background'), alpha=False)
+            self.renderer.set_background(self.bg)
+
+    @property
+    def game_active(self):
+        return self.state.active
+
+    def _create_alien_fleet(self):
+        if self.settings.fleet_backend == 'array':
+            # numpy is only needed for the array backend
+            from array_fleet import ArrayAlienFleet
+            return ArrayAlienFleet(self)
+        return AlienFleet(self)
 
     def run_game(self):
         # Game loop
         while self.running:
-            self._check_events()
-            if self.game_active:
-                self.ship.update()
-                self.alien_fleet.update_fleet()
-                self._check_collisions()
+            dt = self.clock.tick(self.settings.FPS) / 1000
+            events = pygame.event.get()
+            if self.recorder is not None:
+                self.recorder.record(dt, events)
+            self._run_frame(dt, events)
+
+    def _run_frame(self, dt, events=None):
+        # fixed simulation steps for the elapsed time, then one render
+        start = perf_counter()
+        settings = self.settings
+        step = 1 / settings.tick_rate
+        profiler = self.profiler
+        if profiler is None:
+            self._check_events(events)
+        else:
+            timed(profiler, 'events', self._check_events, events)
+
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= step and steps < settings.max_catchup_steps:
+            self.state.update(step)
+            if self.state.playing:
+                self._update_simulation(step)
+            self.accumulator -= step
+            steps += 1
+
+        self.audio.flush()
+
+        if self.accumulator >= step:
+            # still behind: skip a few renders to catch up, then drop the backlog
+            if self.skipped_renders < settings.max_render_skip:
+                self.skipped_renders += 1
+                if profiler is not None:
+                    profiler.end_frame()
+                return
+            self.accumulator %= step
+        self.skipped_renders = 0
+
+        self.renderer.alpha = self.accumulator / step if settings.interpolate else None
+        if profiler is None:
             self._update_screen()
-            self.clock.tick(self.settings.FPS)
+        else:
+            timed(profiler, 'render', self._update_screen)
+            profiler.end_frame()
+        if settings.adaptive_scale:
+            self.renderer.adapt(perf_counter() - start)
+
+    def _update_simulation(self, dt):
+        if self.settings.stress_mode:
+            self._auto_fire(dt)
+        profiler = self.profiler
+        if profiler is None:
+            self.ship.update(dt)
+            self.alien_fleet.update_fleet(dt)
+            self._check_collisions()
+        else:
+            timed(profiler, 'ship', self.ship.update, dt)
+            timed(profiler, 'fleet', self.alien_fleet.update_fleet, dt)
+            timed(profiler, 'collisions', self._check_collisions)
+
+    def _auto_fire(self, dt):
+        rate = self.settings.stress_fire_rate
+        if rate <= 0:
+            return
+        self.auto_fire_timer += dt
+        interval = 1 / rate
+        while self.auto_fire_timer >= interval:
+            self.auto_fire_timer -= interval
+            self.ship.fire()
 
     def _check_collisions(self):
         # check collisions for ship
-        if self.ship.check_collisions(self.alien_fleet.fleet):
+        if self.ship.check_collisions(self.alien_fleet):
             self._check_game_status()
             # subtract a life
 
+        # check alien return fire against the ship
+        fire = self.alien_fleet.arsenal
+        if fire is not None and self.ship.check_collisions(fire):
+            self._check_game_status()
+
         # check collisions for aliens and bottom of screen
         if self.alien_fleet.check_fleet_bottom():
             self._check_game_status()
 
+        if not self.game_active:
+            # the last ship is gone; a cleared wave must not revive the game
+            return
+
         # check collisions for projectiles and aliens
         collisions = self.alien_fleet.check_collisions(self.ship.arsenal.arsenal)
         if collisions:
-                self.impact_sound.play()
-                self.impact_sound.fadeout(500)
+                if self.profiler is not None:
+                    self.profiler.collisions += len(collisions)
+                self.audio.play('impact')
                 self.game_stats.update(collisions)
                 self.HUD.update_scores()
 
@@ -82,32 +222,36 @@ class AlienInvasion:
             self.game_stats.update_level()
             # update HUD view
             self.HUD.update_level()
+            self.state.next_level()
 
     def _check_game_status(self):
         if self.game_stats.ships_left > 0:
             self.game_stats.ships_left -= 1
             self._reset_level()
-            sleep(0.5)
-        else:
-            self.game_active = False
+            self.state.lose_life()
+        elif self.game_active:
+            self.state.game_over()
+            self.game_stats.record_game()
 
 
     def _reset_level(self):
-        self.ship.arsenal.arsenal.empty()
-        self.alien_fleet.fleet.empty()
-        self.alien_fleet.create_fleet()
+        self.assets.sync(self.settings)
+        self.ship.arsenal.reset()
+        self.alien_fleet.reset_fleet()
 
     def restart_game(self):
+        self._wait_for_assets()
         self.settings.initialize__dynamic_settings()
         self.game_stats.reset_stats()
         self.HUD.update_scores()
         self._reset_level()
         self.ship._center_ship()
-        self.game_active = True
+        self.state.start()
         pygame.mouse.set_visible(False)
 
     def _update_screen(self):
-        self.screen.blit(self.bg, (0,0))
+        self._check_background()
+        self.renderer.begin_frame()
         self.ship.draw()
         self.alien_fleet.draw()
         self.HUD.draw()
@@ -115,43 +259,51 @@ class AlienInvasion:
         if not self.game_active:
             self.play_button.draw()
             pygame.mouse.set_visible(True)
+        if self.profiler is not None and self.profiler.overlay:
+            self.profiler.draw()
 
+        self.renderer.end_frame()
 
-        pygame.display.flip()
-
-    def _check_events(self):
-        for event in pygame.event.get():
+    def _check_events(self, events=None):
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
-                self.running = False
-                self.game_stats.save_scores()
-                pygame.quit()
-                sys.exit()
+                self._quit_game()
             elif event.type == pygame.KEYDOWN and self.game_active == True:
                 self._check_keydown_events(event)
             elif event.type == pygame.KEYUP:
                 self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                self._check_button_clicked()
+                self._check_button_clicked(event.pos)
 
-    def _check_button_clicked(self):
-        mouse_pos = pygame.mouse.get_pos()
+    def _check_button_clicked(self, mouse_pos):
+        # the click position comes from the event so replays reproduce it
         if self.play_button.check_clicked(mouse_pos):
             self.restart_game()
 
+    def _quit_game(self):
+        self.running = False
+        self.game_stats.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.profiler is not None:
+            self.profiler.close()
+        pygame.quit()
+        sys.exit()
+
     def _check_keydown_events(self, event):
         if event.key == pygame.K_RIGHT:
             self.ship.moving_right = True
         elif event.key == pygame.K_LEFT:
             self.ship.moving_left = True
-        elif event.key == pygame.K_SPACE:
+        elif event.key == pygame.K_SPACE and self.state.playing:
             if self.ship.fire():
-                self.laser_sound.play()
-                self.laser_sound.fadeout(250)
+                self.audio.play('laser')
+        elif event.key == pygame.K_F3 and self.profiler is not None:
+            self.profiler.overlay = not self.profiler.overlay
         elif event.key == pygame.K_q:
-            self.running = False
-            self.game_stats.save_scores()
-            pygame.quit()
-            sys.exit()
+            self._quit_game()
 
     def _check_keyup_events(self, event):
         if event.key == pygame.K_RIGHT:
@@ -161,4 +313,7 @@ class AlienInvasion:
 
 if __name__ == '__main__':
     ai = AlienInvasion()
+    if len(sys.argv) > 2 and sys.argv[1] == '--record':
+        from replay import InputRecorder
+        ai.recorder = InputRecorder(sys.argv[2], ai.settings)
     ai.run_game()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import numpy as np
+from alien_fleet import AlienFleet
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+
+class ArrayAlienFleet(AlienFleet):
+    # same surface as AlienFleet, but x, y and alive live in numpy arrays
+
+    def __init__(self, game: 'AlienInvasion'):
+        self.boundaries = game.screen.get_rect()
+        self.x = self.y = self.alive = None
+        super().__init__(game)
+        self.image = game.assets.image(self.settings.alien_file,
+                (self.settings.alien_w, self.settings.alien_h)
+                )
+
+    def create_fleet(self):
+        positions = self.fleet_layout()
+        if self.x is None or len(self.x) != len(positions):
+            self.x = np.empty(len(positions))
+            self.y = np.empty(len(positions))
+            self.alive = np.empty(len(positions), dtype=bool)
+        # refill the existing arrays in place from the cached formation
+        self.x[:] = positions[:, 0]
+        self.y[:] = positions[:, 1]
+        self.alive[:] = True
+        self.prev_left, self.prev_top, _, _ = self._rects()
+
+    def export_positions(self):
+        # absolute positions; the array backend moves every alien directly
+        return np.column_stack((self.x, self.y))[self.alive].ravel().tolist()
+
+    def restore_positions(self, positions, offset_x, offset_y, prev_offset):
+        points = np.array(positions, dtype=float).reshape(-1, 2)
+        self.x = points[:, 0].copy()
+        self.y = points[:, 1].copy()
+        self.alive = np.ones(len(points), dtype=bool)
+        self.prev_left, self.prev_top, _, _ = self._rects()
+
+    def fleet_layout(self):
+        layout = super().fleet_layout()
+        if not isinstance(layout, np.ndarray):
+            layout = np.array(layout, dtype=float).reshape(-1, 2)
+            self._layouts[self._layout_key()] = layout
+        return layout
+
+    def _rects(self):
+        # integer rects, rounded the same way Sprite rects are
+        left = np.floor(self.x + 0.5).astype(int)
+        top = np.floor(self.y + 0.5).astype(int)
+        return left, top, left + self.settings.alien_w, top + self.settings.alien_h
+
+    def _check_fleet_edges(self):
+        left, _, right, _ = self._rects()
+        alive = self.alive
+        if (np.any(right[alive] >= self.boundaries.right)
+                or np.any(left[alive] <= self.boundaries.left)):
+            self._drop_alien_fleet()
+            self.fleet_direction *= -1
+
+    def _drop_alien_fleet(self):
+        self.y += self.fleet_drop_speed
+
+    def update_fleet(self, dt):
+        self.prev_left, self.prev_top, _, _ = self._rects()
+        self._check_fleet_edges()
+        self.x += self.settings.fleet_speed * dt * self.fleet_direction
+        if self.arsenal is not None:
+            self.arsenal.update(dt, self)
+
+    def draw(self):
+        image = self.image
+        left, top, _, _ = self._rects()
+        alpha = self.game.renderer.alpha
+        if alpha is not None:
+            left = np.rint(self.prev_left + (left - self.prev_left) * alpha).astype(int)
+            top = np.rint(self.prev_top + (top - self.prev_top) * alpha).astype(int)
+        alive = self.alive
+        self.game.renderer.blits(
+            [(image, pos) for pos in zip(left[alive].tolist(), top[alive].tolist())])
+        if self.arsenal is not None:
+            self.arsenal.draw()
+
+    def _overlaps(self, rects):
+        rects = np.asarray(rects, dtype=int).reshape(-1, 4)
+        left, top, right, bottom = self._rects()
+        other_left = rects[:, 0]
+        other_top = rects[:, 1]
+        other_right = other_left + rects[:, 2]
+        other_bottom = other_top + rects[:, 3]
+        # one row per alien, one column per rect
+        return ((left[:, None] < other_right) & (right[:, None] > other_left)
+                & (top[:, None] < other_bottom) & (bottom[:, None] > other_top)
+                & self.alive[:, None])
+
+    def check_collisions(self, other_group):
+        sprites = other_group.sprites()
+        if not sprites or not self.alive.any():
+            return {}
+
+        hits = self._overlaps([tuple(sprite.rect) for sprite in sprites])
+        collisions = {}
+        used = np.zeros(len(sprites), dtype=bool)
+        for index in np.flatnonzero(hits.any(axis=1)).tolist():
+            columns = np.flatnonzero(hits[index] & ~used)
+            if not len(columns):
+                continue
+            used[columns] = True
+            collisions[index] = [sprites[column] for column in columns.tolist()]
+            self.alive[index] = False
+
+        for column in np.flatnonzero(used).tolist():
+            sprites[column].kill()
+        return collisions
+
+    def collides_with(self, sprite):
+        return bool(self._overlaps([tuple(sprite.rect)]).any())
+
+    def check_fleet_bottom(self):
+        _, _, _, bottom = self._rects()
+        return bool(np.any(bottom[self.alive] >= self.settings.screen_h))
+
+    def check_destroyed_status(self):
+        return not self.alive.any()
+
+    def alien_positions(self):
+        left, top, _, _ = self._rects()
+        return np.column_stack((left, top))[self.alive]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
@@ -10,23 +10,64 @@ class Arsenal:
         self.game = game
         self.settings = game.settings
         self.arsenal = pygame.sprite.Group()
+        self.pool = []
+        self.capacity = 0
+        self._offscreen = []
+        self._load_image()
+        self._resize_pool()
+
+    def _load_image(self):
+        # shared by every pooled Bullet
+        self.image = self.game.assets.image(self.settings.bullet_file,
+                (self.settings.bullet_w, self.settings.bullet_h)
+                )
+
+    def _resize_pool(self):
+        self.capacity = self.settings.bullet_amount
+        missing = self.capacity - len(self.pool) - len(self.arsenal)
+        if missing > 0:
+            self.pool.extend(Bullet(self) for _ in range(missing))
+        elif missing < 0:
+            # bullets still in flight are dropped by release() instead
+            del self.pool[:min(-missing, len(self.pool))]
+
+    def release(self, bullet):
+        if len(self.pool) + len(self.arsenal) < self.capacity:
+            self.pool.append(bullet)
+
+    def reset(self):
+        for bullet in self.arsenal.sprites():
+            bullet.kill()
+        self._load_image()
     
-    def update_arsenal(self):
-        self.arsenal.update()
+    def update_arsenal(self, dt):
+        self.arsenal.update(dt)
         self._remove_bullets_offscreen()
 
     def _remove_bullets_offscreen(self):
-        for bullet in self.arsenal.copy():
+        offscreen = self._offscreen
+        for bullet in self.arsenal:
             if bullet.rect.bottom <= 0:
-                self.arsenal.remove(bullet)
+                offscreen.append(bullet)
+        for bullet in offscreen:
+            bullet.kill()
+        offscreen.clear()
 
     def draw(self):
-        for bullet in self.arsenal:
-            bullet.draw_bullet()
+        alpha = self.game.renderer.alpha
+        image = self.image
+        if alpha is None:
+            pairs = [(image, bullet.rect) for bullet in self.arsenal]
+        else:
+            pairs = [(image, bullet.render_pos(alpha)) for bullet in self.arsenal]
+        self.game.renderer.blits(pairs)
 
     def fire_bullet(self):
-        if len(self.arsenal) < self.settings.bullet_amount:
-            new_bullet = Bullet(self.game)
-            self.arsenal.add(new_bullet)
+        if self.capacity != self.settings.bullet_amount:
+            self._resize_pool()
+        if self.pool:
+            bullet = self.pool.pop()
+            bullet.fire(self.game.ship.rect.midtop)
+            self.arsenal.add(bullet)
             return True
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,66 @@
+import pygame
+
+
+class AssetCache:
+
+    def __init__(self):
+        self.images = {}
+        self.hits = 0
+        self.misses = 0
+        self.atlas = None
+        self._sizes = {}
+
+    def use_atlas(self, atlas):
+        self.atlas = atlas
+
+    def image(self, path, size, alpha=True):
+        key = (str(path), (int(size[0]), int(size[1])), alpha)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if alpha and self.atlas is not None:
+            surface = self.atlas.region(path, key[1])
+            if surface is not None:
+                self.images[key] = surface
+                return surface
+
+        return self.add(path, size, self.decode(path, size), alpha)
+
+    def decode(self, path, size):
+        # file decode and scale only, so it can run on the preloader thread
+        surface = pygame.image.load(str(path))
+        return pygame.transform.scale(surface, (int(size[0]), int(size[1])))
+
+    def add(self, path, size, surface, alpha=True):
+        key = (str(path), (int(size[0]), int(size[1])), alpha)
+        if pygame.display.get_surface() is not None:
+            # match the display pixel format once, instead of on every blit
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        self.images[key] = surface
+        return surface
+
+    def invalidate(self, path=None):
+        if path is None:
+            self.images.clear()
+            return
+        for key in [key for key in self.images if key[0] == str(path)]:
+            del self.images[key]
+
+    def sync(self, settings):
+        # drop every cached scale of an image whose Settings size changed
+        sizes = {
+            settings.ship_file: (settings.ship_w, settings.ship_h),
+            settings.alien_file: (settings.alien_w, settings.alien_h),
+            settings.bullet_file: (settings.bullet_w, settings.bullet_h),
+        }
+        for path, size in sizes.items():
+            if self._sizes.get(path, size) != size:
+                self.invalidate(path)
+        self._sizes = sizes
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self.images)}
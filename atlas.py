@@ -0,0 +1,105 @@
+import hashlib
+import json
+import pygame
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from settings import Settings
+
+MAX_WIDTH = 1024
+PADDING = 1
+
+
+class TextureAtlas:
+
+    def __init__(self, entries, cache_dir: Path):
+        # entries are (image path, (width, height)) pairs, pre-scaled sizes
+        self.entries = [(str(path), (int(size[0]), int(size[1]))) for path, size in entries]
+        self.cache_dir = Path(cache_dir)
+        self.key = self._cache_key()
+        self.regions = {}
+        self.surface = None
+        self.from_cache = False
+
+    @classmethod
+    def for_settings(cls, settings: 'Settings'):
+        return cls([
+            (settings.ship_file, (settings.ship_w, settings.ship_h)),
+            (settings.alien_file, (settings.alien_w, settings.alien_h)),
+            (settings.bullet_file, (settings.bullet_w, settings.bullet_h)),
+            ], settings.atlas_cache_dir)
+
+    def _cache_key(self):
+        digest = hashlib.sha1()
+        for path, size in self.entries:
+            stat = Path(path).stat()
+            digest.update(f'{path}|{stat.st_mtime_ns}|{stat.st_size}|{size}'.encode())
+        return digest.hexdigest()
+
+    def load(self):
+        if not self._load_cached():
+            self._build()
+            self._save()
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        return self
+
+    def _load_cached(self):
+        image_path = self.cache_dir / 'atlas.png'
+        index_path = self.cache_dir / 'atlas.json'
+        if not (image_path.exists() and index_path.exists()):
+            return False
+        try:
+            index = json.loads(index_path.read_text())
+        except ValueError:
+            return False
+        if index.get('key') != self.key:
+            return False
+        self.surface = pygame.image.load(str(image_path))
+        self.regions = {(path, (w, h)): pygame.Rect(x, y, w, h)
+                        for path, w, h, x, y in index['regions']}
+        self.from_cache = True
+        return True
+
+    def _build(self):
+        images = []
+        for path, size in dict.fromkeys(self.entries):
+            image = pygame.transform.scale(pygame.image.load(path), size)
+            images.append((path, size, image))
+
+        # shelf packing, tallest images first
+        images.sort(key=lambda item: item[1][1], reverse=True)
+        x = y = shelf_h = width = 0
+        for path, (w, h), _ in images:
+            if x and x + w > MAX_WIDTH:
+                x = 0
+                y += shelf_h + PADDING
+                shelf_h = 0
+            self.regions[(path, (w, h))] = pygame.Rect(x, y, w, h)
+            x += w + PADDING
+            shelf_h = max(shelf_h, h)
+            width = max(width, x)
+
+        self.surface = pygame.Surface((max(width, 1), max(y + shelf_h, 1)), pygame.SRCALPHA)
+        for path, size, image in images:
+            self.surface.blit(image, self.regions[(path, size)])
+
+    def _save(self):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            pygame.image.save(self.surface, str(self.cache_dir / 'atlas.png'))
+            index = {
+                'key': self.key,
+                'regions': [[path, w, h, rect.x, rect.y]
+                            for (path, (w, h)), rect in self.regions.items()],
+            }
+            (self.cache_dir / 'atlas.json').write_text(json.dumps(index, indent=4))
+        except OSError as e:
+            print(f'Could not cache texture atlas: {e}')
+
+    def region(self, path, size):
+        rect = self.regions.get((str(path), (int(size[0]), int(size[1]))))
+        if rect is None:
+            return None
+        return self.surface.subsurface(rect)
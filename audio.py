@@ -0,0 +1,98 @@
+import pygame
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from settings import Settings
+
+
+class AudioManager:
+
+    def __init__(self, settings: 'Settings'):
+        self.settings = settings
+        self.sounds = {}
+        self.channels = {}
+        self._next_channel = {}
+        self._pending = {}
+        self.played = 0
+        self.coalesced = 0
+
+    def load(self):
+        # runs on the preloader thread
+        pygame.mixer.init()
+        total = sum(self.settings.audio_channels.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+
+        index = 0
+        for name, count in self.settings.audio_channels.items():
+            self.channels[name] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            self._next_channel[name] = 0
+            index += count
+
+        for name, path in self.settings.sound_files.items():
+            sound = self._decode(Path(path))
+            sound.set_volume(self.settings.sound_volume)
+            self.sounds[name] = sound
+        return self
+
+    def _decode(self, path: Path):
+        # cache the decoded samples in the mixer's own format so later
+        # launches skip the MP3 decode
+        frequency, size, channels = pygame.mixer.get_init()
+        stat = path.stat()
+        cache = self.settings.sound_cache_dir / (
+            f'{path.stem}-{stat.st_mtime_ns}-{frequency}-{size}-{channels}.raw')
+        if cache.exists():
+            return pygame.mixer.Sound(buffer=cache.read_bytes())
+
+        sound = pygame.mixer.Sound(str(path))
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            cache.write_bytes(sound.get_raw())
+        except OSError as e:
+            print(f'Could not cache decoded sound: {e}')
+        return sound
+
+    def play(self, name):
+        # duplicate triggers within one frame collapse into one
+        if name in self._pending:
+            self.coalesced += 1
+        self._pending[name] = True
+
+    def flush(self):
+        if not self._pending:
+            return
+        for name in self._pending:
+            sound = self.sounds.get(name)
+            channels = self.channels.get(name)
+            if sound is None or not channels:
+                continue
+            channel = self._free_channel(name, channels)
+            channel.play(sound)
+            fadeout = self.settings.audio_fadeout.get(name)
+            if fadeout:
+                channel.fadeout(fadeout)
+            self.played += 1
+        self._pending.clear()
+
+    def _free_channel(self, name, channels):
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        # every channel in the category is busy: steal the oldest
+        index = self._next_channel[name]
+        self._next_channel[name] = (index + 1) % len(channels)
+        return channels[index]
+
+
+class NullAudio:
+
+    def load(self):
+        return self
+
+    def play(self, name):
+        pass
+
+    def flush(self):
+        pass
@@ -0,0 +1,309 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from time import monotonic, perf_counter
+import pygame
+from settings import Settings
+from headless import HeadlessRunner, scripted_input
+from spatial_hash import SpatialHash
+
+RESOLUTIONS = ((640, 360), (1265, 625), (1920, 1080))
+ALIEN_SIZES = (30, 20, 12)
+COLLISION_SIZES = ((100, 5), (1000, 20), (1000, 100), (5000, 100), (10000, 500))
+STRESS_COUNTS = (250, 1000, 2500, 5000, 10000)
+STRESS_FORMATIONS = ('grid', 'random', 'waves')
+MEMORY_COUNTS = (1000, 10000, 100000)
+
+# runs in a fresh interpreter; prints when the first frame was flipped
+# and when the background preloads finished, on the shared monotonic clock
+STARTUP_PROBE = '''
+import time
+from settings import Settings
+from alien_invasion import AlienInvasion
+settings = Settings()
+settings.headless = True
+# the dummy audio driver still decodes, so the preload is measured
+settings.audio_backend = 'mixer'
+game = AlienInvasion(settings)
+game._update_screen()
+first_flip = time.monotonic()
+game.preloader.wait()
+print(first_flip, time.monotonic())
+'''
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_frames(frames, backend='sprite', render_mode='dirty', batch_blits=True,
+        resolutions=RESOLUTIONS, alien_sizes=ALIEN_SIZES, render_scale=1.0):
+    results = []
+    for screen_w, screen_h in resolutions:
+        for alien_size in alien_sizes:
+            settings = Settings()
+            settings.screen_w, settings.screen_h = screen_w, screen_h
+            settings.alien_w = settings.alien_h = alien_size
+            settings.fleet_backend = backend
+            settings.render_mode = render_mode
+            settings.batch_blits = batch_blits
+            settings.render_scale = render_scale
+
+            runner = HeadlessRunner(settings, scripted_input(frames))
+            fleet_size = len(runner.game.alien_fleet)
+            result = runner.run(frames)
+            result.update({
+                'resolution': [screen_w, screen_h],
+                'alien_size': alien_size,
+                'fleet_size': fleet_size,
+                'backend': backend,
+                'render_mode': render_mode,
+                'batch_blits': batch_blits,
+                'render_scale': render_scale,
+                })
+            results.append(result)
+            print(f'{backend:<6} {screen_w}x{screen_h} aliens={fleet_size:<5} '
+                  f'{result["fps"]:8.1f} fps', file=sys.stderr)
+    return results
+
+
+def bench_draw(frames, backend='sprite', render_mode='dirty'):
+    # the same runs with per-sprite blits and with one blits() per layer
+    before = bench_frames(frames, backend, render_mode, batch_blits=False)
+    after = bench_frames(frames, backend, render_mode, batch_blits=True)
+    results = []
+    for single, batched in zip(before, after):
+        results.append({
+            'resolution': batched['resolution'],
+            'fleet_size': batched['fleet_size'],
+            'single_render_ms': single['phase_ms']['render'],
+            'batched_render_ms': batched['phase_ms']['render'],
+            'speedup': (single['phase_ms']['render'] / batched['phase_ms']['render']
+                        if batched['phase_ms']['render'] else None),
+            })
+    return results
+
+
+def bench_stress(frames, backend='sprite', counts=STRESS_COUNTS,
+        formations=STRESS_FORMATIONS):
+    results = []
+    for formation in formations:
+        for count in counts:
+            settings = Settings()
+            settings.stress_mode = True
+            settings.stress_formation = formation
+            settings.stress_alien_count = count
+            settings.fleet_backend = backend
+
+            runner = HeadlessRunner(settings, scripted_input(frames))
+            result = runner.run(frames)
+            frame_ms = 1000 / result['fps'] if result['fps'] else None
+            result.update({
+                'formation': formation,
+                'aliens': count,
+                'backend': backend,
+                'frame_ms': frame_ms,
+                'us_per_alien': frame_ms * 1000 / count if frame_ms else None,
+                })
+            results.append(result)
+            print(f'{backend:<6} {formation:<6} aliens={count:<6} '
+                  f'{frame_ms:8.2f} ms/frame', file=sys.stderr)
+    return results
+
+
+def bench_startup(repeats=5):
+    root = os.path.dirname(os.path.abspath(__file__))
+    first_flips = []
+    preloads = []
+    for _ in range(repeats):
+        start = monotonic()
+        output = subprocess.run([sys.executable, '-c', STARTUP_PROBE], cwd=root,
+            capture_output=True, text=True, check=True).stdout
+        first_flip, preloaded = map(float, output.split()[-2:])
+        first_flips.append((first_flip - start) * 1000)
+        preloads.append((preloaded - start) * 1000)
+    print(f'first flip {statistics.median(first_flips):8.1f} ms  '
+          f'assets ready {statistics.median(preloads):8.1f} ms', file=sys.stderr)
+    return [{
+        'repeats': repeats,
+        'first_flip_ms': statistics.median(first_flips),
+        'assets_ready_ms': statistics.median(preloads),
+        'first_flip_samples_ms': first_flips,
+        }]
+
+
+class _BaselineSprite(pygame.sprite.Sprite):
+    # the original Alien/Bullet layout: a per-instance __dict__ holding
+    # its own references and its own scaled copy of the image
+    def __init__(self, source, size, **attrs):
+        super().__init__()
+        self.__dict__.update(attrs)
+        self.image = pygame.transform.scale(source, size)
+        self.rect = self.image.get_rect()
+
+
+def _bytes_per_sprite(make, count):
+    group = pygame.sprite.Group()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        group.add(make())
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / count
+
+
+def bench_memory(counts=MEMORY_COUNTS):
+    from alien import Alien
+    from bullet import Bullet
+    settings = Settings()
+    settings.headless = True
+    runner = HeadlessRunner(settings, {})
+    game = runner.game
+    fleet, arsenal = game.alien_fleet, game.ship.arsenal
+    screen = game.screen
+    alien_size = (settings.alien_w, settings.alien_h)
+    bullet_size = (settings.bullet_w, settings.bullet_h)
+    kinds = {
+        'alien': (
+            lambda: _BaselineSprite(fleet.image, alien_size, fleet=fleet, screen=screen,
+                boundaries=screen.get_rect(), settings=settings, x=0.0, y=0.0),
+            lambda: Alien(fleet, 0, 0),
+            alien_size),
+        'bullet': (
+            lambda: _BaselineSprite(arsenal.image, bullet_size, screen=screen,
+                settings=settings, y=0.0),
+            lambda: Bullet(arsenal),
+            bullet_size),
+    }
+    results = []
+    for kind, (before, after, (w, h)) in kinds.items():
+        # pixel buffers come from SDL's allocator, which tracemalloc cannot see
+        pixel_bytes = w * h * screen.get_bytesize()
+        for count in counts:
+            before_bytes = _bytes_per_sprite(before, count)
+            after_bytes = _bytes_per_sprite(after, count)
+            results.append({
+                'sprite': kind,
+                'count': count,
+                'baseline_bytes_per_sprite': before_bytes,
+                'baseline_pixel_bytes_per_sprite': pixel_bytes,
+                'slots_bytes_per_sprite': after_bytes,
+                'slots_pixel_bytes_per_sprite': 0,
+                })
+            print(f'{kind:<6} n={count:<6} baseline {before_bytes:7.1f} B '
+                  f'+ {pixel_bytes} B pixels  __slots__ {after_bytes:7.1f} B', file=sys.stderr)
+    return results
+
+
+def _sprites(rects):
+    group = pygame.sprite.Group()
+    for rect in rects:
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rect)
+        group.add(sprite)
+    return group
+
+
+def bench_collisions(repeats=5, sizes=COLLISION_SIZES, seed=0):
+    settings = Settings()
+    settings.initialize__dynamic_settings()
+    alien_w, alien_h = settings.alien_w, settings.alien_h
+    bullet_w, bullet_h = settings.bullet_w, settings.bullet_h
+    results = []
+    for alien_count, bullet_count in sizes:
+        rng = random.Random(seed)
+        cols = int(alien_count ** 0.5) or 1
+        alien_rects = [(alien_w * (i % cols), alien_h * (i // cols), alien_w, alien_h)
+                       for i in range(alien_count)]
+        width = alien_w * cols
+        height = alien_h * (alien_count // cols + 1)
+        bullet_rects = [(rng.randrange(width), rng.randrange(height), bullet_w, bullet_h)
+                        for _ in range(bullet_count)]
+
+        brute = grid = update = 0.0
+        for _ in range(repeats):
+            aliens, bullets = _sprites(alien_rects), _sprites(bullet_rects)
+            start = perf_counter()
+            pygame.sprite.groupcollide(aliens, bullets, False, False)
+            brute += perf_counter() - start
+
+            hashed = SpatialHash(alien_w, alien_h)
+            for alien in aliens:
+                hashed.insert(alien)
+            start = perf_counter()
+            for bullet in bullets:
+                hashed.query(bullet.rect)
+            grid += perf_counter() - start
+
+            # one frame of fleet movement
+            for alien in aliens:
+                alien.rect.x += 1
+            start = perf_counter()
+            hashed.update_all(aliens)
+            update += perf_counter() - start
+
+        results.append({
+            'aliens': alien_count,
+            'bullets': bullet_count,
+            'groupcollide_ms': brute * 1000 / repeats,
+            'spatial_hash_ms': grid * 1000 / repeats,
+            'spatial_hash_update_ms': update * 1000 / repeats,
+            })
+        print(f'aliens={alien_count:<6} bullets={bullet_count:<4} '
+              f'groupcollide {brute * 1000 / repeats:8.3f} ms  '
+              f'spatial hash {grid * 1000 / repeats:8.3f} ms '
+              f'(+{update * 1000 / repeats:.3f} ms update)', file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless frame-throughput benchmark')
+    parser.add_argument('suite', nargs='?', choices=('frames', 'collisions', 'draw', 'startup', 'stress',
+        'memory'), default='frames')
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--backend', choices=('sprite', 'array'), default='sprite')
+    parser.add_argument('--render-mode', choices=('full', 'dirty'), default='dirty')
+    parser.add_argument('--render-scale', type=float, default=1.0)
+    parser.add_argument('--output', help='write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    if args.suite == 'collisions':
+        results = bench_collisions()
+    elif args.suite == 'stress':
+        results = bench_stress(args.frames, args.backend)
+    elif args.suite == 'memory':
+        results = bench_memory()
+    elif args.suite == 'startup':
+        results = bench_startup()
+    elif args.suite == 'draw':
+        results = bench_draw(args.frames, args.backend, args.render_mode)
+    else:
+        results = bench_frames(args.frames, args.backend, args.render_mode,
+            render_scale=args.render_scale)
+
+    report = {
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'suite': args.suite,
+        'results': results,
+    }
+    contents = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(contents)
+    else:
+        print(contents)
+
+
+if __name__ == '__main__':
+    main()
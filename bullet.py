@@ -1,27 +1,41 @@
-import pygame
 from pygame.sprite import Sprite
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from alien_invasion import AlienInvasion
+    from arsenal import Arsenal
 
 class Bullet(Sprite):
-    def __init__(self, game: 'AlienInvasion'):
+    # see Alien: slotted so pooled bullets carry no __dict__
+    __slots__ = ('_Sprite__g', 'arsenal', 'rect', 'y', 'prev_y')
+
+    def __init__(self, arsenal: 'Arsenal'):
         super().__init__()
-        self.screen = game.screen
-        self.settings = game.settings
-
-        self.image = pygame.image.load(str(self.settings.bullet_file))
-        self.image = pygame.transform.scale(self.image,
-                (self.settings.bullet_w, self.settings.bullet_h)
-                )
-        self.rect = self.image.get_rect()
-        self.rect.midtop = game.ship.rect.midtop
+        self.arsenal = arsenal
+
+        self.rect = arsenal.image.get_rect()
+        self.y = float(self.rect.y)
+        self.prev_y = self.rect.y
+
+    @property
+    def image(self):
+        return self.arsenal.image
+
+    def fire(self, midtop):
+        # pooled bullets pick up a resized image from Arsenal.reset
+        self.rect.size = self.arsenal.image.get_size()
+        self.rect.midtop = midtop
         self.y = float(self.rect.y)
+        self.prev_y = self.rect.y
+
+    def kill(self):
+        # groupcollide and offscreen culling both end up here
+        super().kill()
+        self.arsenal.release(self)
 
-    def update(self):
-        self.y -= self.settings.bullet_speed
+    def update(self, dt):
+        self.prev_y = self.rect.y
+        self.y -= self.arsenal.settings.bullet_speed * dt
         self.rect.y = self.y
 
-    def draw_bullet(self):
-        self.screen.blit(self.image, self.rect)
\ No newline at end of file
+    def render_pos(self, alpha):
+        return (self.rect.x, round(self.prev_y + (self.rect.y - self.prev_y) * alpha))
@@ -0,0 +1,123 @@
+import numpy as np
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+NOOP, LEFT, RIGHT, FIRE, LEFT_FIRE, RIGHT_FIRE = range(6)
+ACTIONS = ('noop', 'left', 'right', 'fire', 'left_fire', 'right_fire')
+
+
+class AlienInvasionEnv:
+
+    def __init__(self, settings: Settings = None, render=False, frame_skip=1,
+            life_penalty=0.0):
+        self.settings = settings or Settings()
+        self.settings.headless = not render
+        # bot episodes never reach the player's scores, even in a window
+        self.settings.persist_scores = False
+        self.render_frames = render
+        self.frame_skip = frame_skip
+        self.life_penalty = life_penalty
+        self.game = AlienInvasion(self.settings)
+        self.step_dt = 1 / self.settings.tick_rate
+        self.action_count = len(ACTIONS)
+        # fixed observation shapes: the largest wave and the bullet cap
+        self.max_aliens = len(self.game.alien_fleet.fleet_layout())
+        self.max_bullets = self.settings.bullet_amount
+        fire = self.game.alien_fleet.arsenal
+        self.max_alien_shots = len(fire.x) if fire is not None else 0
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.settings.stress_seed = seed
+        self.game.restart_game()
+        self.game.accumulator = 0.0
+        return self._observation()
+
+    def step(self, action):
+        game = self.game
+        ship = game.ship
+        ship.moving_left = action in (LEFT, LEFT_FIRE)
+        ship.moving_right = action in (RIGHT, RIGHT_FIRE)
+        if action in (FIRE, LEFT_FIRE, RIGHT_FIRE) and game.state.playing:
+            ship.fire()
+
+        stats = game.game_stats
+        score, ships_left = stats.score, stats.ships_left
+        for _ in range(self.frame_skip):
+            game.state.update(self.step_dt)
+            if game.state.playing:
+                game._update_simulation(self.step_dt)
+            if not game.game_active:
+                break
+        game.audio.flush()
+        if self.render_frames:
+            game._update_screen()
+
+        reward = stats.score - score
+        if stats.ships_left < ships_left or not game.game_active:
+            reward -= self.life_penalty
+        done = not game.game_active
+        info = {'level': stats.level, 'ships_left': stats.ships_left, 'score': stats.score}
+        return self._observation(), float(reward), done, info
+
+    def _observation(self):
+        game = self.game
+        aliens = np.zeros((self.max_aliens, 3), dtype=np.float32)
+        positions = np.asarray(game.alien_fleet.alien_positions(), dtype=np.float32)
+        count = min(len(positions), self.max_aliens)
+        if count:
+            aliens[:count, :2] = positions[:count]
+            aliens[:count, 2] = 1.0
+
+        bullets = np.zeros((self.max_bullets, 3), dtype=np.float32)
+        for i, bullet in enumerate(game.ship.arsenal.arsenal):
+            if i >= self.max_bullets:
+                break
+            bullets[i] = (bullet.rect.x, bullet.rect.y, 1.0)
+
+        alien_shots = np.zeros((self.max_alien_shots, 3), dtype=np.float32)
+        fire = game.alien_fleet.arsenal
+        if fire is not None and fire.count:
+            left, top = fire._rects()
+            alien_shots[:fire.count] = np.column_stack((left, top, np.ones(fire.count)))
+
+        stats = game.game_stats
+        return {
+            'ship_x': np.float32(game.ship.rect.x),
+            'aliens': aliens,
+            'bullets': bullets,
+            'alien_shots': alien_shots,
+            'score': np.float32(stats.score),
+            'lives': np.int32(stats.ships_left),
+        }
+
+
+class VectorAlienInvasionEnv:
+
+    def __init__(self, count, settings_factory=Settings, **env_kwargs):
+        self.envs = [AlienInvasionEnv(settings_factory(), **env_kwargs)
+                     for _ in range(count)]
+        self.count = count
+
+    def _stack(self, observations):
+        return {key: np.stack([obs[key] for obs in observations])
+                for key in observations[0]}
+
+    def reset(self, seed=None):
+        return self._stack([env.reset(None if seed is None else seed + i)
+                            for i, env in enumerate(self.envs)])
+
+    def step(self, actions):
+        observations = []
+        rewards = np.zeros(self.count, dtype=np.float32)
+        dones = np.zeros(self.count, dtype=bool)
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, rewards[i], dones[i], info = env.step(int(action))
+            if dones[i]:
+                # finished games restart straight away, gym vector-env style
+                info['final_observation'] = obs
+                obs = env.reset()
+            observations.append(obs)
+            infos.append(info)
+        return self._stack(observations), rewards, dones, infos
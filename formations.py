@@ -0,0 +1,59 @@
+import math
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from settings import Settings
+
+
+def _area(settings: 'Settings'):
+    # aliens spawn in the top half of the screen, like the normal fleet
+    width = settings.screen_w - settings.alien_w * 2
+    height = settings.screen_h // 2 - settings.alien_h
+    return settings.alien_w, settings.alien_h, max(width, 1), max(height, 1)
+
+
+def dense_grid(settings: 'Settings', count, rng=None):
+    left, top, width, height = _area(settings)
+    cols = max(1, math.ceil(math.sqrt(count * width / height)))
+    rows = max(1, math.ceil(count / cols))
+    # cells shrink below the alien size once the count no longer fits
+    step_x = min(settings.alien_w, width / cols)
+    step_y = min(settings.alien_h, height / rows)
+    x_offset = left + (width - step_x * cols) / 2
+    return [(int(x_offset + step_x * (i % cols)), int(top + step_y * (i // cols)))
+            for i in range(count)]
+
+
+def random_scatter(settings: 'Settings', count, rng=None):
+    rng = rng or random.Random(settings.stress_seed)
+    left, top, width, height = _area(settings)
+    return [(left + rng.randrange(width), top + rng.randrange(height))
+            for _ in range(count)]
+
+
+def waves(settings: 'Settings', count, rng=None):
+    left, top, width, height = _area(settings)
+    rows = max(1, height // settings.alien_h)
+    per_row = max(1, math.ceil(count / rows))
+    positions = []
+    for i in range(count):
+        row, col = divmod(i, per_row)
+        x = left + (width * col) // per_row
+        # each row is a sine wave, offset from the one above it
+        y = top + (row % rows) * settings.alien_h + settings.alien_h / 2 * (
+            1 + math.sin(col / per_row * 4 * math.pi + row))
+        positions.append((x, int(min(y, top + height))))
+    return positions
+
+
+FORMATIONS = {
+    'grid': dense_grid,
+    'random': random_scatter,
+    'waves': waves,
+}
+
+
+def generate(settings: 'Settings'):
+    formation = FORMATIONS[settings.stress_formation]
+    return formation(settings, settings.stress_alien_count)
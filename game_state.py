@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+PLAYING = 'playing'
+LIFE_LOST = 'life_lost'
+LEVEL_TRANSITION = 'level_transition'
+GAME_OVER = 'game_over'
+
+
+class GameState:
+
+    def __init__(self, game: 'AlienInvasion'):
+        self.settings = game.settings
+        self.current = GAME_OVER
+        self.timer = 0.0
+
+    @property
+    def playing(self):
+        return self.current == PLAYING
+
+    @property
+    def active(self):
+        # a game is in progress, even if it is paused between lives or levels
+        return self.current != GAME_OVER
+
+    def start(self):
+        self._enter(PLAYING)
+
+    def lose_life(self):
+        if self.active:
+            self._enter(LIFE_LOST, self.settings.life_lost_pause)
+
+    def next_level(self):
+        # only start() leaves GAME_OVER
+        if self.active:
+            self._enter(LEVEL_TRANSITION, self.settings.level_transition_pause)
+
+    def game_over(self):
+        self._enter(GAME_OVER)
+
+    def _enter(self, state, duration=0.0):
+        if duration <= 0 and state != GAME_OVER:
+            state = PLAYING
+        self.current = state
+        self.timer = duration if state in (LIFE_LOST, LEVEL_TRANSITION) else 0.0
+
+    def update(self, dt):
+        # counts down on the game clock, so pauses never block the loop
+        if self.timer > 0:
+            self.timer -= dt
+            if self.timer <= 0:
+                self.timer = 0.0
+                self.current = PLAYING
@@ -1,5 +1,4 @@
-# from pathlib import Path
-import json
+from score_store import ScoreStore
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -15,25 +14,22 @@ class GameStats():
         self.reset_stats()
 
     def init_saved_scores(self):
-        self.path = self.settings.scores_file
-        if self.path.exists() and self.path.__sizeof__() > 20:
-            contents = self.path.read_text()
-            scores = json.loads(contents)
-            self.hi_score = scores.get('hi_score', 0)
-        else:
-            self.hi_score = 0
+        self.store = ScoreStore(self.settings)
+        self.path = self.store.path
+        self.hi_score = self.store.hi_score
+        if not self.path.exists():
             self.save_scores()
-            # save the file
 
     def save_scores(self):
-        scores = {
-            'hi_score': self.hi_score
-        }
-        contents = json.dumps(scores, indent=4)
-        try:
-            self.path.write_text(contents)
-        except FileNotFoundError as e:
-            print(f'File Not Found: {e}')
+        # queued for the store's writer thread, never blocks the frame
+        self.store.save(self.hi_score)
+
+    def record_game(self):
+        self.store.record_game(self.score, self.level)
+
+    def close(self):
+        self.save_scores()
+        self.store.close()
     
     def reset_stats(self):
         self.ships_left = self.settings.starting_ship_count
@@ -60,6 +56,7 @@ class GameStats():
     def _update_hi_score(self):
         if self.score > self.hi_score:
             self.hi_score = self.score
+            self.save_scores()
 
     def update_level(self):
         self.level += 1
@@ -0,0 +1,70 @@
+import string
+import pygame
+import pygame.font
+
+PRERENDERED = string.digits + string.ascii_letters + string.punctuation + ' '
+
+
+def _display_format(surface):
+    # match the display pixel format once, instead of on every blit
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+class GlyphAtlas:
+
+    def __init__(self, font, color, chars=PRERENDERED):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+
+        rendered = [(char, font.render(char, True, color)) for char in chars]
+        width = sum(glyph.get_width() for _, glyph in rendered)
+        self.surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        x = 0
+        areas = {}
+        for char, glyph in rendered:
+            area = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            # MAX copies the glyph's own alpha onto the transparent atlas
+            self.surface.blit(glyph, area, special_flags=pygame.BLEND_RGBA_MAX)
+            areas[char] = area
+            x += area.width
+        self.surface = _display_format(self.surface)
+        self.glyphs = {char: (self.surface, area) for char, area in areas.items()}
+
+    def _glyph(self, char):
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            image = _display_format(self.font.render(char, True, self.color))
+            glyph = self.glyphs[char] = (image, image.get_rect())
+        return glyph
+
+    def render(self, text):
+        glyphs = [self._glyph(char) for char in text]
+        width = sum(area.width for _, area in glyphs)
+        image = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        x = 0
+        sequence = []
+        for source, area in glyphs:
+            sequence.append((source, (x, 0), area, pygame.BLEND_RGBA_MAX))
+            x += area.width
+        image.blits(sequence, doreturn=False)
+        return _display_format(image)
+
+
+class GlyphCache:
+
+    def __init__(self):
+        self.fonts = {}
+        self.atlases = {}
+
+    def atlas(self, font_file, size, color):
+        key = (str(font_file), size, tuple(color))
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            font = self.fonts.get(key[:2])
+            if font is None:
+                font = self.fonts[key[:2]] = pygame.font.Font(font_file, size)
+            atlas = self.atlases[key] = GlyphAtlas(font, color)
+        return atlas
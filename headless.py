@@ -0,0 +1,66 @@
+import pygame
+from time import perf_counter
+from settings import Settings
+from alien_invasion import AlienInvasion
+from profiler import PHASES
+from snapshot import restore
+
+
+def scripted_input(frames, fire_every=6, turn_every=90):
+    # sweep the ship left and right while firing on a fixed cadence
+    script = {}
+    direction = pygame.K_RIGHT
+    for frame in range(0, frames, turn_every):
+        other = pygame.K_LEFT if direction == pygame.K_RIGHT else pygame.K_RIGHT
+        script.setdefault(frame, []).extend([
+            pygame.event.Event(pygame.KEYUP, key=other),
+            pygame.event.Event(pygame.KEYDOWN, key=direction),
+            ])
+        direction = other
+    for frame in range(0, frames, fire_every):
+        script.setdefault(frame, []).append(
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    return script
+
+
+class HeadlessRunner:
+
+    def __init__(self, settings: Settings = None, script=None, snapshot=None):
+        self.settings = settings or Settings()
+        self.settings.headless = True
+        # the runner reads its per-phase costs from the frame profiler
+        self.settings.profiler = True
+        self.game = AlienInvasion(self.settings)
+        self.script = script or {}
+        # start from a saved state instead of level 1
+        self.snapshot = snapshot
+
+    def run(self, frames):
+        game = self.game
+        profiler = game.profiler
+        step = 1 / self.settings.tick_rate
+        restarts = 0
+        game.restart_game()
+        if self.snapshot is not None:
+            restore(game, self.snapshot)
+        before = dict(profiler.totals)
+
+        start = perf_counter()
+        for frame in range(frames):
+            # one fixed simulation step and one render per frame
+            game._run_frame(step, self.script.get(frame, ()))
+            if not game.game_active:
+                game.restart_game()
+                restarts += 1
+        elapsed = perf_counter() - start
+
+        return {
+            'frames': frames,
+            'seconds': elapsed,
+            'fps': frames / elapsed if elapsed else 0.0,
+            'phase_ms': {name: (profiler.totals[name] - before[name]) / 1e6 / frames
+                         for name in PHASES},
+            'level': game.game_stats.level,
+            'score': game.game_stats.score,
+            'restarts': restarts,
+        }
@@ -12,67 +12,81 @@ class HUD:
         self.screen = game.screen
         self.boundaires = game.screen.get_rect()
         self.game_stats = game.game_stats
-        self.font = pygame.font.Font(self.settings.font_file,
-            self.settings.HUD_font_size)
+        self.font = game.glyphs.atlas(self.settings.font_file,
+            self.settings.HUD_font_size, self.settings.text_color)
         self.padding = 20
+        self._shown = {}
         self.update_scores()
         self._setup_life_image()
         self.update_level()
 
     def _setup_life_image(self):
-        self.life_image = pygame.image.load(self.settings.ship_file)
-        self.life_image = pygame.transform.scale(self.life_image, (
+        self.life_image = self.game.assets.image(self.settings.ship_file, (
             self.settings.ship_w, self.settings.ship_h
             ))
         self.life_rect = self.life_image.get_rect()
     
 
+    def _changed(self, field, value):
+        # only rebuild a text surface when its value actually changed
+        if self._shown.get(field) == value:
+            return False
+        self._shown[field] = value
+        return True
+
     def update_scores(self):
         self._update_max_score()
         self._update_score()
         self._update_hi_score()
 
     def _update_score(self):
+        if not self._changed('score', self.game_stats.score):
+            return
         score_str = f'Score: {self.game_stats.score: ,.0f}'
-        self.score_image = self.font.render(score_str, True,
-            self.settings.text_color, None)
+        self.score_image = self.font.render(score_str)
         self.score_rect = self.score_image.get_rect()
         self.score_rect.right = self.boundaires.right - self.padding
         self.score_rect.top = self.max_score_rect.bottom + self.padding
 
     def _update_max_score(self):
+        if not self._changed('max_score', self.game_stats.max_score):
+            return
         max_score_str = f'Max Score: {self.game_stats.max_score: ,.0f}'
-        self.max_score_image = self.font.render(max_score_str, True,
-            self.settings.text_color, None)
+        self.max_score_image = self.font.render(max_score_str)
         self.max_score_rect = self.max_score_image.get_rect()
         self.max_score_rect.right = self.boundaires.right - self.padding
         self.max_score_rect.top = self.padding
 
     def _update_hi_score(self):
+        if not self._changed('hi_score', self.game_stats.hi_score):
+            return
         hi_score_str = f'Hi-Score: {self.game_stats.hi_score: ,.0f}'
-        self.hi_score_image = self.font.render(hi_score_str, True,
-            self.settings.text_color, None)
+        self.hi_score_image = self.font.render(hi_score_str)
         self.hi_score_rect = self.hi_score_image.get_rect()
         self.hi_score_rect.midtop = (self.boundaires.centerx,self.padding)
 
     def update_level(self):
+        if not self._changed('level', self.game_stats.level):
+            return
         level_str = f'Level: {self.game_stats.level: ,.0f}'
-        self.level_image = self.font.render(level_str, True,
-            self.settings.text_color, None)
+        self.level_image = self.font.render(level_str)
         self.level_rect = self.level_image.get_rect()
         self.level_rect.left = self.padding
         self.level_rect.top = self.life_rect.bottom + self.padding
     
-    def _draw_lives(self):
+    def _draw_lives(self, pairs):
         current_x = self.padding
         current_y = self.padding
         for _ in range(self.game_stats.ships_left):
-            self.screen.blit(self.life_image, (current_x, current_y))
+            pairs.append((self.life_image, (current_x, current_y)))
             current_x += self.life_rect.width + self.padding
     
     def draw(self):
-        self.screen.blit(self.hi_score_image, self.hi_score_rect)
-        self.screen.blit(self.max_score_image, self.max_score_rect)
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self._draw_lives()
\ No newline at end of file
+        pairs = [
+            (self.hi_score_image, self.hi_score_rect),
+            (self.max_score_image, self.max_score_rect),
+            (self.score_image, self.score_rect),
+            (self.level_image, self.level_rect),
+            ]
+        self._draw_lives(pairs)
+        self.game.renderer.blits(pairs)
\ No newline at end of file
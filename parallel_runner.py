@@ -0,0 +1,170 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+from time import perf_counter
+from settings import Settings
+
+
+def make_jobs(grid, seeds=1, steps=5000, replay=None):
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in range(seeds):
+            jobs.append({
+                'id': len(jobs),
+                'overrides': dict(zip(names, values)),
+                'seed': seed,
+                'steps': steps,
+                'replay': replay,
+                })
+    return jobs
+
+
+def _random_policy(settings, seed, steps):
+    # imported here so each worker process builds its own game
+    from env import AlienInvasionEnv
+
+    env = AlienInvasionEnv(settings)
+    rng = random.Random(seed)
+    env.reset(seed)
+    frame_times = []
+    done = False
+    info = {}
+    start = perf_counter()
+    for _ in range(steps):
+        step_start = perf_counter()
+        _, _, done, info = env.step(rng.randrange(env.action_count))
+        frame_times.append(perf_counter() - step_start)
+        if done:
+            break
+    elapsed = perf_counter() - start
+    frame_times.sort()
+    return {
+        'frames': len(frame_times),
+        'seconds': elapsed,
+        'mean_ms': elapsed * 1000 / len(frame_times),
+        'p95_ms': frame_times[int(len(frame_times) * 0.95)] * 1000,
+        'score': info.get('score', 0),
+        'level': info.get('level', 1),
+        'game_over': done,
+    }
+
+
+def _init_worker():
+    # SDL would turn the pool's SIGTERM into an SDL_QUIT event nobody reads
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+
+def run_job(job):
+    import pygame
+
+    settings = Settings()
+    settings.overrides = dict(job['overrides'])
+    settings.stress_seed = job['seed']
+    try:
+        if job['replay']:
+            from replay import ReplayDriver
+            result = ReplayDriver(job['replay'], settings).run()
+        else:
+            result = _random_policy(settings, job['seed'], job['steps'])
+    finally:
+        pygame.quit()
+    result.update(job=job['id'], overrides=job['overrides'], seed=job['seed'])
+    return result
+
+
+class SweepAggregate:
+
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, result):
+        key = json.dumps(result['overrides'], sort_keys=True)
+        group = self.groups.setdefault(key, {
+            'overrides': result['overrides'], 'runs': 0,
+            'mean_level': 0.0, 'max_level': 0,
+            'mean_score': 0.0, 'max_score': 0,
+            'mean_frame_ms': 0.0,
+            })
+        # running means, so results never need to be kept around
+        group['runs'] += 1
+        n = group['runs']
+        group['mean_level'] += (result['level'] - group['mean_level']) / n
+        group['mean_score'] += (result['score'] - group['mean_score']) / n
+        group['mean_frame_ms'] += (result['mean_ms'] - group['mean_frame_ms']) / n
+        group['max_level'] = max(group['max_level'], result['level'])
+        group['max_score'] = max(group['max_score'], result['score'])
+
+    def summary(self):
+        return list(self.groups.values())
+
+
+class ParallelRunner:
+
+    def __init__(self, processes=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        self.aggregate = SweepAggregate()
+
+    def run(self, jobs):
+        # spawn gives every worker a clean pygame and SDL state
+        context = multiprocessing.get_context('spawn')
+        pool = context.Pool(self.processes, initializer=_init_worker)
+        try:
+            for result in pool.imap_unordered(run_job, jobs):
+                self.aggregate.add(result)
+                yield result
+            # let the workers exit on their own rather than terminate them
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+
+def _parse_value(value):
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        # bare words such as fleet_backend=array stay strings
+        return value
+
+
+def _parse_param(text):
+    name, _, values = text.partition('=')
+    return name, [_parse_value(value) for value in values.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run headless simulations across cores')
+    parser.add_argument('--param', action='append', default=[], type=_parse_param,
+        help='setting sweep, e.g. --param fleet_speed=60,90,120')
+    parser.add_argument('--seeds', type=int, default=1)
+    parser.add_argument('--steps', type=int, default=5000)
+    parser.add_argument('--replay', help='drive every run from this input log')
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--output', help='stream per-run JSON lines to this file')
+    args = parser.parse_args(argv)
+
+    jobs = make_jobs(dict(args.param), args.seeds, args.steps, args.replay)
+    runner = ParallelRunner(args.processes)
+    output = open(args.output, 'w') if args.output else None
+    try:
+        for done, result in enumerate(runner.run(jobs), 1):
+            if output is not None:
+                output.write(json.dumps(result) + '\n')
+                output.flush()
+            print(f'[{done}/{len(jobs)}] {result["overrides"]} seed={result["seed"]} '
+                  f'level={result["level"]} score={result["score"]}', file=sys.stderr)
+    finally:
+        if output is not None:
+            output.close()
+    print(json.dumps(runner.aggregate.summary(), indent=4))
+
+
+if __name__ == '__main__':
+    main()
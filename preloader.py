@@ -0,0 +1,47 @@
+import threading
+
+
+class Preloader:
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.done = {}
+        self._tasks = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, name, func, *args):
+        self.done[name] = threading.Event()
+        with self._lock:
+            self._tasks.append((name, func, args))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work,
+                    name='asset-preloader', daemon=True)
+                self._thread.start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    return
+                name, func, args = self._tasks.pop(0)
+            try:
+                self.results[name] = func(*args)
+            except Exception as e:
+                self.errors[name] = e
+            self.done[name].set()
+
+    def ready(self, name):
+        return self.done[name].is_set()
+
+    def result(self, name):
+        # readiness barrier: blocks until the named task has finished
+        self.done[name].wait()
+        if name in self.errors:
+            raise self.errors[name]
+        return self.results[name]
+
+    def wait(self):
+        for name in list(self.done):
+            self.done[name].wait()
@@ -0,0 +1,114 @@
+import csv
+import json
+from collections import deque
+from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+PHASES = ('events', 'ship', 'fleet', 'collisions', 'render')
+COUNTERS = ('sprites', 'collisions', 'blits')
+
+
+class FrameProfiler:
+
+    def __init__(self, game: 'AlienInvasion'):
+        self.game = game
+        self.settings = game.settings
+        self.overlay = self.settings.profiler_overlay
+        window = self.settings.profiler_window
+        self.samples = {name: deque(maxlen=window) for name in PHASES + ('frame',)}
+        self.current = dict.fromkeys(PHASES, 0)
+        self.totals = dict.fromkeys(PHASES, 0)
+        self.collisions = 0
+        self.frames = 0
+        self._last_blits = 0
+        self._overlay_images = []
+
+        self._file = None
+        self._writer = None
+        output = self.settings.profiler_output
+        if output:
+            self._open(Path(output))
+
+    def _open(self, path):
+        self._file = open(path, 'w', newline='')
+        if path.suffix == '.csv':
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(('frame',) + tuple(f'{name}_ns' for name in PHASES)
+                                  + ('frame_ns',) + COUNTERS)
+
+    def add(self, phase, ns):
+        self.current[phase] += ns
+
+    def end_frame(self):
+        game = self.game
+        total = sum(self.current.values())
+        for name, ns in self.current.items():
+            self.samples[name].append(ns)
+            self.totals[name] += ns
+        self.samples['frame'].append(total)
+
+        blits = game.renderer.blit_count - self._last_blits
+        self._last_blits = game.renderer.blit_count
+        counters = (len(game.alien_fleet) + len(game.ship.arsenal.arsenal),
+                    self.collisions, blits)
+
+        if self._writer is not None:
+            self._writer.writerow((self.frames,) + tuple(self.current.values())
+                                  + (total,) + counters)
+        elif self._file is not None:
+            # same keys as the CSV header, so phases never clash with counters
+            row = {'frame': self.frames}
+            row.update((f'{name}_ns', ns) for name, ns in self.current.items())
+            row['frame_ns'] = total
+            row.update(zip(COUNTERS, counters))
+            self._file.write(json.dumps(row) + '\n')
+
+        self.frames += 1
+        self.collisions = 0
+        for name in self.current:
+            self.current[name] = 0
+
+    def percentiles(self, name):
+        samples = sorted(self.samples[name])
+        if not samples:
+            return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        last = len(samples) - 1
+        return {f'p{p}': samples[min(last, len(samples) * p // 100)] / 1e6
+                for p in (50, 95, 99)}
+
+    def summary(self):
+        return {name: self.percentiles(name) for name in self.samples}
+
+    def draw(self):
+        # the overlay text is rebuilt a few times per second, not every frame
+        if self.frames % self.settings.profiler_overlay_interval == 0 or not self._overlay_images:
+            font = self.game.glyphs.atlas(self.settings.font_file,
+                self.settings.profiler_font_size, self.settings.text_color)
+            lines = []
+            for name in PHASES + ('frame',):
+                p = self.percentiles(name)
+                lines.append(f'{name:<10} {p["p50"]:6.2f} {p["p95"]:6.2f} {p["p99"]:6.2f} ms')
+            self._overlay_images = [font.render(line) for line in lines]
+
+        x = 20
+        y = self.game.HUD.level_rect.bottom + 20
+        pairs = []
+        for image in self._overlay_images:
+            pairs.append((image, (x, y)))
+            y += image.get_height()
+        self.game.renderer.blits(pairs)
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+
+def timed(profiler, phase, func, *args):
+    start = perf_counter_ns()
+    result = func(*args)
+    profiler.add(phase, perf_counter_ns() - start)
+    return result
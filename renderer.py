@@ -0,0 +1,197 @@
+import weakref
+import pygame
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alien_invasion import AlienInvasion
+
+
+class Renderer:
+
+    def __init__(self, game: 'AlienInvasion'):
+        self.game = game
+        self.settings = game.settings
+        self.display = game.screen
+        # forks compose onto their own surface and never touch the window
+        self.offscreen = self.display is not pygame.display.get_surface()
+        self.dirty = self.settings.render_mode == 'dirty'
+        self._rects = []
+        self._last_rects = []
+        self._full_redraw = True
+        # frames spent over budget or with headroom, for adaptive scaling
+        self._over = 0
+        self._under = 0
+        self._backgrounds = {}
+        self.set_scale(self.settings.render_scale)
+        # fraction of a simulation step to interpolate sprites by,
+        # or None to draw them at their current rects
+        self.alpha = None
+        self.blit_count = 0
+        self.full_frames = 0
+        self.dirty_frames = 0
+
+    def invalidate(self):
+        self._full_redraw = True
+
+    def set_background(self, bg):
+        # called once the preloader has decoded the background
+        self.game.bg = bg
+        self._backgrounds = {}
+        if self.settings.adaptive_scale:
+            # every scale adapt() can reach, so stepping down never stalls
+            scale = self.settings.render_scale - self.settings.render_scale_step
+            while scale >= self.settings.render_scale_min - 1e-9:
+                self._background(self._canvas_size(scale))
+                scale -= self.settings.render_scale_step
+        self.set_scale(self.scale)
+
+    def _canvas_size(self, scale):
+        return (max(1, round(self.settings.screen_w * scale)),
+                max(1, round(self.settings.screen_h * scale)))
+
+    def _background(self, size):
+        # scaled from the loaded background in memory; decoding the file
+        # again would stall exactly the frames adapt() is trying to rescue
+        bg = self._backgrounds.get(size)
+        if bg is None:
+            bg = self._backgrounds[size] = self._transform(self.game.bg, size)
+        return bg
+
+    def set_scale(self, scale):
+        # below 1.0 everything is composed onto a smaller canvas in
+        # logical coordinates and upscaled to the window in end_frame
+        self.scale = scale
+        self._scaled = weakref.WeakKeyDictionary()
+        if scale >= 1:
+            self.scale = 1.0
+            self.screen = self.display
+            self.bg = self.game.bg
+        else:
+            size = self._canvas_size(scale)
+            self.screen = pygame.Surface(size, 0, self.display)
+            self.bg = None if self.game.bg is None else self._background(size)
+        self.screen_area = self.screen.get_width() * self.screen.get_height()
+        self._last_rects = []
+        self.invalidate()
+
+    def adapt(self, frame_time):
+        # steps the internal resolution down while frames run over budget,
+        # and back up, more reluctantly, once there is headroom again
+        settings = self.settings
+        budget = 1 / (settings.FPS or settings.tick_rate)
+        if frame_time > budget:
+            self._over += 1
+            self._under = 0
+        elif frame_time < budget * settings.adaptive_scale_headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        frames = settings.adaptive_scale_frames
+        if self._over >= frames and self.scale > settings.render_scale_min:
+            self.set_scale(max(settings.render_scale_min,
+                               self.scale - settings.render_scale_step))
+            self._over = 0
+        elif self._under >= frames * 4 and self.scale < settings.render_scale:
+            self.set_scale(min(settings.render_scale, self.scale + settings.render_scale_step))
+            self._under = 0
+
+    def _image(self, surface):
+        scaled = self._scaled.get(surface)
+        if scaled is None:
+            w, h = surface.get_size()
+            size = (max(1, round(w * self.scale)), max(1, round(h * self.scale)))
+            try:
+                scaled = self._transform(surface, size)
+            except ValueError:
+                # smoothscale only takes 24 and 32 bit surfaces
+                scaled = pygame.transform.scale(surface, size)
+            self._scaled[surface] = scaled
+        return scaled
+
+    def _transform(self, surface, size, dest=None):
+        if self.settings.render_scale_filter == 'smooth':
+            if dest is None:
+                return pygame.transform.smoothscale(surface, size)
+            return pygame.transform.smoothscale(surface, size, dest)
+        if dest is None:
+            return pygame.transform.scale(surface, size)
+        return pygame.transform.scale(surface, size, dest)
+
+    def _dest(self, dest):
+        scale = self.scale
+        return (round(dest[0] * scale), round(dest[1] * scale))
+
+    def begin_frame(self):
+        bg = self.bg
+        if self.dirty and not self._full_redraw:
+            # paint the background back over last frame's sprites only
+            for rect in self._last_rects:
+                if bg is None:
+                    self.screen.fill(self.settings.bg_color, rect)
+                else:
+                    self.screen.blit(bg, rect, rect)
+        elif bg is None:
+            self.screen.fill(self.settings.bg_color)
+        else:
+            self.screen.blit(bg, (0, 0))
+        self._rects = []
+
+    def blit(self, surface, dest):
+        self.blit_count += 1
+        if self.scale != 1:
+            surface, dest = self._image(surface), self._dest(dest)
+        rect = self.screen.blit(surface, dest)
+        if self.dirty:
+            self._rects.append(rect)
+        return rect
+
+    def blits(self, pairs):
+        if self.scale != 1:
+            pairs = [(self._image(surface), self._dest(dest)) for surface, dest in pairs]
+        if not self.settings.batch_blits:
+            for surface, dest in pairs:
+                self.blit_count += 1
+                rect = self.screen.blit(surface, dest)
+                if self.dirty:
+                    self._rects.append(rect)
+        elif self.dirty:
+            self.blit_count += len(pairs)
+            self._rects.extend(self.screen.blits(pairs))
+        else:
+            self.blit_count += len(pairs)
+            self.screen.blits(pairs, doreturn=False)
+
+    def fill(self, color, rect):
+        self.blit_count += 1
+        if self.scale != 1:
+            rect = pygame.Rect(self._dest(rect), self._dest(pygame.Rect(rect).size))
+        rect = self.screen.fill(color, rect)
+        if self.dirty:
+            self._rects.append(rect)
+        return rect
+
+    def end_frame(self):
+        if self.scale != 1:
+            # one upscale of the whole canvas replaces the partial updates
+            self._transform(self.screen, self.display.get_size(), self.display)
+            self._flip()
+        elif not self.dirty or self._full_redraw:
+            self._flip()
+        else:
+            changed = self._last_rects + self._rects
+            area = sum(rect.w * rect.h for rect in changed)
+            if area > self.settings.dirty_rect_threshold * self.screen_area:
+                self._flip()
+            else:
+                if not self.offscreen:
+                    pygame.display.update(changed)
+                self.dirty_frames += 1
+        self._last_rects = self._rects
+        self._full_redraw = False
+
+    def _flip(self):
+        if not self.offscreen:
+            pygame.display.flip()
+        self.full_frames += 1
@@ -0,0 +1,121 @@
+import argparse
+import json
+import struct
+from time import perf_counter
+import pygame
+from settings import Settings
+from alien_invasion import AlienInvasion
+
+MAGIC = b'AIRP'
+VERSION = 1
+# magic, version, tick rate, screen width, screen height
+HEADER = struct.Struct('<4sHHHH')
+# frame time in seconds, number of events
+FRAME = struct.Struct('<dH')
+# event kind, key, x, y
+EVENT = struct.Struct('<Bihh')
+
+KINDS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.QUIT)
+
+
+class InputRecorder:
+
+    def __init__(self, path, settings: Settings):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, settings.tick_rate,
+            settings.screen_w, settings.screen_h))
+        self.frames = 0
+
+    def record(self, dt, events):
+        packed = []
+        for event in events:
+            if event.type not in KINDS:
+                continue
+            x, y = getattr(event, 'pos', (0, 0))
+            packed.append(EVENT.pack(KINDS.index(event.type),
+                getattr(event, 'key', 0), x, y))
+        self.file.write(FRAME.pack(dt, len(packed)))
+        self.file.write(b''.join(packed))
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_log(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, tick_rate, screen_w, screen_h = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} is not a version {VERSION} input log')
+
+    frames = []
+    offset = HEADER.size
+    while offset < len(data):
+        dt, count = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        events = [EVENT.unpack_from(data, offset + i * EVENT.size) for i in range(count)]
+        offset += count * EVENT.size
+        frames.append((dt, events))
+    return (tick_rate, screen_w, screen_h), frames
+
+
+class ReplayDriver:
+
+    def __init__(self, path, settings: Settings = None):
+        (tick_rate, screen_w, screen_h), self.frames = read_log(path)
+        self.settings = settings or Settings()
+        self.settings.headless = True
+        self.settings.tick_rate = tick_rate
+        self.settings.screen_w, self.settings.screen_h = screen_w, screen_h
+        self.game = AlienInvasion(self.settings)
+
+    def _events(self, packed):
+        events = []
+        for kind, key, x, y in packed:
+            event_type = KINDS[kind]
+            # quitting would tear down pygame; the log simply ends instead
+            if event_type == pygame.QUIT or (event_type == pygame.KEYDOWN
+                    and key == pygame.K_q):
+                continue
+            if event_type == pygame.MOUSEBUTTONDOWN:
+                events.append(pygame.event.Event(event_type, pos=(x, y), button=1))
+            else:
+                events.append(pygame.event.Event(event_type, key=key))
+        return events
+
+    def run(self):
+        game = self.game
+        frames = [(dt, self._events(packed)) for dt, packed in self.frames]
+        frame_times = []
+        start = perf_counter()
+        for dt, events in frames:
+            frame_start = perf_counter()
+            game._run_frame(dt, events)
+            frame_times.append(perf_counter() - frame_start)
+        elapsed = perf_counter() - start
+
+        frame_times.sort()
+        count = len(frame_times)
+        return {
+            'frames': count,
+            'seconds': elapsed,
+            'mean_ms': elapsed * 1000 / count if count else 0.0,
+            'p95_ms': frame_times[int(count * 0.95)] * 1000 if count else 0.0,
+            'max_ms': frame_times[-1] * 1000 if count else 0.0,
+            'score': game.game_stats.score,
+            'level': game.game_stats.level,
+            'ships_left': game.game_stats.ships_left,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded input log headless')
+    parser.add_argument('log')
+    args = parser.parse_args(argv)
+    print(json.dumps(ReplayDriver(args.log).run(), indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from settings import Settings
+
+
+def atomic_write(path: Path, contents: str):
+    # temp file in the same directory, fsync, then rename over the target
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class ScoreStore:
+
+    def __init__(self, settings: 'Settings'):
+        self.settings = settings
+        self.path = settings.scores_file
+        self.history_path = settings.history_file
+        self.leaderboard_path = settings.leaderboard_file
+        self.persist = settings.persist_scores
+
+        self.hi_score = self._load_hi_score()
+        self.leaderboard = []
+        self.loaded = threading.Event()
+
+        self._lock = threading.Condition()
+        self._pending_hi_score = None
+        self._pending_games = []
+        self._dirty_leaderboard = False
+        self._closing = False
+        self._thread = None
+        if not self.persist:
+            # nothing to load or write, so no writer thread to leak
+            self.loaded.set()
+            return
+        self._thread = threading.Thread(target=self._work, name='score-store', daemon=True)
+        self._thread.start()
+
+    def _load_hi_score(self):
+        # only the hi-score is read before the first frame
+        try:
+            # the file's size on disk, not the size of the Path object
+            if self.path.exists() and self.path.stat().st_size > 0:
+                return json.loads(self.path.read_text()).get('hi_score', 0)
+        except (OSError, ValueError) as e:
+            print(f'Could not read scores: {e}')
+        return 0
+
+    def _load_leaderboard(self):
+        try:
+            return json.loads(self.leaderboard_path.read_text()).get('top', [])
+        except (OSError, ValueError):
+            pass
+        # rebuild the index from the append-only history
+        games = []
+        try:
+            with open(self.history_path) as f:
+                for line in f:
+                    try:
+                        games.append(json.loads(line))
+                    except ValueError:
+                        continue  # a torn final line from a crash
+        except OSError:
+            pass
+        return self._top(games)
+
+    def _top(self, games):
+        games = sorted(games, key=lambda game: game['score'], reverse=True)
+        return games[:self.settings.leaderboard_size]
+
+    def save(self, hi_score):
+        if self._thread is None:
+            return
+        with self._lock:
+            # later saves overwrite earlier ones that have not been written yet
+            self._pending_hi_score = hi_score
+            self._lock.notify()
+
+    def record_game(self, score, level):
+        game = {'score': score, 'level': level, 'time': time.time()}
+        if self._thread is None:
+            self.leaderboard = self._top(self.leaderboard + [game])
+            return
+        with self._lock:
+            self._pending_games.append(game)
+            self._lock.notify()
+
+    def _work(self):
+        leaderboard = self._load_leaderboard()
+        with self._lock:
+            self.leaderboard = leaderboard
+        self.loaded.set()
+
+        while True:
+            with self._lock:
+                while (self._pending_hi_score is None and not self._pending_games
+                       and not self._closing):
+                    self._lock.wait()
+                hi_score, self._pending_hi_score = self._pending_hi_score, None
+                games, self._pending_games = self._pending_games, []
+                if games:
+                    self.leaderboard = self._top(self.leaderboard + games)
+                leaderboard = list(self.leaderboard)
+                closing = self._closing
+            if self.persist:
+                self._write(hi_score, games, leaderboard)
+            if closing and hi_score is None and not games:
+                return
+
+    def _write(self, hi_score, games, leaderboard):
+        try:
+            if hi_score is not None:
+                atomic_write(self.path, json.dumps({'hi_score': hi_score}, indent=4))
+            if games:
+                with open(self.history_path, 'a') as f:
+                    f.write(''.join(json.dumps(game) + '\n' for game in games))
+                    f.flush()
+                    os.fsync(f.fileno())
+                atomic_write(self.leaderboard_path, json.dumps({'top': leaderboard}, indent=4))
+        except OSError as e:
+            print(f'Could not save scores: {e}')
+
+    def close(self):
+        # flush whatever is still queued before the process exits
+        if self._thread is None:
+            return
+        with self._lock:
+            self._closing = True
+            self._lock.notify()
+        self._thread.join()
@@ -7,9 +7,51 @@ class Settings:
         self.screen_w  = 1265
         self.screen_h  = 625
         self.FPS       = 60
+        # simulation ticks per second, independent of the render cap above
+        self.tick_rate = 60
+        self.max_catchup_steps = 5
+        self.max_render_skip = 2
+        self.interpolate = True
+        # seconds the game pauses after a lost ship and between levels
+        self.life_lost_pause = 0.5
+        self.level_transition_pause = 0.5
+
+        # per-phase frame profiler; output is a .csv or JSON-lines file
+        self.profiler = False
+        self.profiler_overlay = False
+        self.profiler_window = 600
+        self.profiler_output = None
+        self.profiler_overlay_interval = 15
+        self.profiler_font_size = 14
+        # speeds are pixels per second; the game was tuned in pixels
+        # per frame at 60 FPS
+        self.speed_unit = 60
+        self.headless  = False
+        # 'full' redraws and flips every frame, 'dirty' only updates the
+        # rects that changed, falling back to a flip past the threshold
+        self.render_mode = 'dirty'
+        self.dirty_rect_threshold = 0.5
+        # submit each draw layer with one Surface.blits call
+        self.batch_blits = True
+        # compose at this fraction of the window size, then upscale with
+        # 'nearest' or 'smooth' filtering; adaptive scaling steps down to
+        # render_scale_min after adaptive_scale_frames over the FPS budget
+        self.render_scale = 1.0
+        self.render_scale_filter = 'nearest'
+        self.adaptive_scale = False
+        self.render_scale_min = 0.5
+        self.render_scale_step = 0.25
+        self.adaptive_scale_frames = 30
+        self.adaptive_scale_headroom = 0.6
         self.bg_file   = Path.cwd() / 'Assets' / 'images' / 'Starbasesnow.png'
+        # drawn until the background has been decoded in the background
+        self.bg_color  = (0, 0, 0)
         self.difficulty_scale = 1.1
         self.scores_file = Path.cwd() / 'Assets' / 'file' / 'scores.json'
+        self.history_file = Path.cwd() / 'Assets' / 'file' / 'history.jsonl'
+        self.leaderboard_file = Path.cwd() / 'Assets' / 'file' / 'leaderboard.json'
+        self.leaderboard_size = 10
+        self.persist_scores = True
 
         self.ship_file  = Path.cwd() / 'Assets' / 'images' / 'ship2(no bg).png'
         self.ship_w     = 30
@@ -19,6 +61,15 @@ class Settings:
         self.bullet_file = Path.cwd() / 'Assets' / 'images' / 'laserBlast.png'
         self.laser_sound = Path.cwd() / 'Assets' / 'sound' / 'laser.mp3'
         self.impact_sound = Path.cwd() / 'Assets' / 'sound' / 'impactSound.mp3'
+        self.sound_files = {'laser': self.laser_sound, 'impact': self.impact_sound}
+        self.sound_volume = 0.7
+        # 'mixer' plays through pygame.mixer, 'null' stays silent;
+        # None picks 'null' for headless games and 'mixer' otherwise
+        self.audio_backend = None
+        # channels reserved per sound, and how fast each one fades out
+        self.audio_channels = {'laser': 2, 'impact': 3}
+        self.audio_fadeout = {'laser': 250, 'impact': 500}
+        self.sound_cache_dir = Path.cwd() / 'Assets' / 'cache' / 'sound'
         
         
         
@@ -28,6 +79,19 @@ class Settings:
         self.alien_w = 30
         self.alien_h = 30
         self.fleet_direction = 1
+        # 'sprite' keeps one Alien per enemy, 'array' uses numpy arrays
+        self.fleet_backend = 'sprite'
+        # 'spatial_hash' buckets aliens on an alien-sized grid,
+        # 'brute' tests every alien/bullet pair with groupcollide
+        self.collision_broadphase = 'spatial_hash'
+        # aliens fire back; shots live in fixed-size numpy buffers
+        self.alien_fire = True
+        self.alien_bullet_capacity = 1024
+        self.alien_bullet_w = 8
+        self.alien_bullet_h = 24
+        # shots per second grow by this factor each level, up to the cap
+        self.alien_fire_scale = 1.25
+        self.alien_fire_rate_max = 30
         
 
         self.button_w = 200
@@ -39,20 +103,44 @@ class Settings:
         self.HUD_font_size = 20
         self.font_file = Path.cwd() / 'Assets' / 'Fonts' / 'Silkscreen' / 'Silkscreen-Bold.ttf'
 
+        # sprite images packed into one surface, cached between launches
+        self.use_atlas = True
+        self.atlas_cache_dir = Path.cwd() / 'Assets' / 'cache'
+
+        # stress mode: massive fleets from formations.py and auto-fire
+        self.stress_mode = False
+        self.stress_alien_count = 2000
+        self.stress_formation = 'grid'
+        self.stress_fire_rate = 20
+        self.stress_bullet_amount = 200
+        self.stress_seed = 0
+
+        # name -> value pairs re-applied after every dynamic reset,
+        # used by parameter sweeps
+        self.overrides = {}
+
     def initialize__dynamic_settings(self):
-        self.ship_speed = 7
+        self.ship_speed = 7 * self.speed_unit
         self.starting_ship_count = 3
 
-        self.bullet_speed = 10
+        self.bullet_speed = 10 * self.speed_unit
         self.bullet_w = 20
         self.bullet_h = 50
-        self.bullet_amount = 5
+        self.bullet_amount = self.stress_bullet_amount if self.stress_mode else 5
 
-        self.fleet_speed = 1
+        self.fleet_speed = 1 * self.speed_unit
         self.fleet_drop_speed = 30
         self.alien_points = 50
+        self.alien_fire_rate = 0.5
+        self.alien_bullet_speed = 4 * self.speed_unit
+
+        for name, value in self.overrides.items():
+            setattr(self, name, value)
 
     def increase_difficulty(self):
-        self.ship_speed += self.difficulty_scale
-        self.bullet_speed += self.difficulty_scale
-        self.fleet_speed += self.difficulty_scale
\ No newline at end of file
+        step = self.difficulty_scale * self.speed_unit
+        self.ship_speed += step
+        self.bullet_speed += step
+        self.fleet_speed += step
+        self.alien_bullet_speed += step
+        self.alien_fire_rate *= self.alien_fire_scale
\ No newline at end of file
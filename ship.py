@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from alien_invasion import AlienInvasion
     from arsenal import Arsenal
+    from alien_fleet import AlienFleet
 
 class Ship:
 
@@ -13,8 +14,7 @@ class Ship:
         self.screen = game.screen
         self.boundaries = self.screen.get_rect()
 
-        self.image = pygame.image.load(self.settings.ship_file)
-        self.image = pygame.transform.scale(self.image,
+        self.image = game.assets.image(self.settings.ship_file,
                 (self.settings.ship_w, self.settings.ship_h)
                 )
         
@@ -27,14 +27,16 @@ class Ship:
     def _center_ship(self):
         self.rect.midbottom = self.boundaries.midbottom
         self.x = float(self.rect.x)
+        self.prev_x = self.rect.x
 
-    def update(self):
+    def update(self, dt):
         # updating position of ship
-        self._update_ship_movement()
-        self.arsenal.update_arsenal()
+        self._update_ship_movement(dt)
+        self.arsenal.update_arsenal(dt)
 
-    def _update_ship_movement(self):
-        temp_speed = self.settings.ship_speed
+    def _update_ship_movement(self, dt):
+        self.prev_x = self.rect.x
+        temp_speed = self.settings.ship_speed * dt
         if self.moving_right and self.rect.right < self.boundaries.right:
             self.x += temp_speed
         if self.moving_left and self.rect.left > self.boundaries.left:
@@ -42,15 +44,20 @@ class Ship:
 
         self.rect.x = self.x
 
+    def render_pos(self, alpha):
+        return (round(self.prev_x + (self.rect.x - self.prev_x) * alpha), self.rect.y)
+
     def draw(self):
         self.arsenal.draw()
-        self.screen.blit(self.image, self.rect)
+        alpha = self.game.renderer.alpha
+        self.game.renderer.blit(self.image,
+            self.rect if alpha is None else self.render_pos(alpha))
 
     def fire(self):
         return self.arsenal.fire_bullet()
     
-    def check_collisions(self, other_group):
-        if pygame.sprite.spritecollideany(self, other_group):
+    def check_collisions(self, fleet: 'AlienFleet'):
+        if fleet.collides_with(self):
             self._center_ship()
             return True
         return False
\ No newline at end of file
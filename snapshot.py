@@ -0,0 +1,181 @@
+import copy
+import struct
+import sys
+from array import array
+import numpy as np
+from pathlib import Path
+import pygame
+from game_state import PLAYING, LIFE_LOST, LEVEL_TRANSITION, GAME_OVER
+from alien_invasion import AlienInvasion
+from bullet import Bullet
+
+MAGIC = b'AISS'
+VERSION = 2
+BACKENDS = ('sprite', 'array')
+STATES = (PLAYING, LIFE_LOST, LEVEL_TRANSITION, GAME_OVER)
+# magic, version, fleet backend, screen width, screen height, aliens, bullets,
+# alien shots
+HEADER = struct.Struct('<4sHBHHIII')
+# game state, state timer, accumulator, auto-fire timer
+GAME = struct.Struct('<Bddd')
+# ship x, previous rect x, moving right, moving left
+SHIP = struct.Struct('<di??')
+# direction, drop speed, offset x, offset y, previous offset x, previous offset y
+FLEET = struct.Struct('<bdddii')
+# alien fire timer, shots fired so far
+FIRE = struct.Struct('<dq')
+# score, max score, hi score, level, ships left
+STATS = struct.Struct('<qqqIh')
+# everything initialize__dynamic_settings resets
+DYNAMIC = struct.Struct('<ddddhHHIidd')
+# the per-entity arrays follow: alien x, y pairs, then bullet and alien shot
+# x, y, previous y triples, all little-endian float64
+
+
+def _pack_floats(values):
+    floats = array('d', values)
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats.tobytes()
+
+
+def _unpack_floats(data, offset, count):
+    floats = array('d')
+    floats.frombytes(data[offset:offset + count * floats.itemsize])
+    if sys.byteorder == 'big':
+        floats.byteswap()
+    return floats, offset + count * floats.itemsize
+
+
+def snapshot(game: 'AlienInvasion'):
+    settings = game.settings
+    ship, fleet, stats = game.ship, game.alien_fleet, game.game_stats
+    positions = fleet.export_positions()
+    bullets = []
+    for bullet in ship.arsenal.arsenal:
+        bullets.extend((bullet.rect.x, bullet.y, bullet.prev_y))
+    fire = fleet.arsenal
+    shots = []
+    if fire is not None:
+        n = fire.count
+        shots = np.column_stack((fire.x[:n], fire.y[:n], fire.prev_y[:n])).ravel().tolist()
+
+    return b''.join((
+        HEADER.pack(MAGIC, VERSION, BACKENDS.index(settings.fleet_backend),
+            settings.screen_w, settings.screen_h, len(positions) // 2, len(bullets) // 3,
+            len(shots) // 3),
+        GAME.pack(STATES.index(game.state.current), game.state.timer,
+            game.accumulator, game.auto_fire_timer),
+        SHIP.pack(ship.x, ship.prev_x, ship.moving_right, ship.moving_left),
+        FLEET.pack(fleet.fleet_direction, fleet.fleet_drop_speed, fleet.offset_x,
+            fleet.offset_y, *fleet.prev_offset),
+        FIRE.pack(fire.timer, fire.shots) if fire is not None else FIRE.pack(0.0, 0),
+        STATS.pack(stats.score, stats.max_score, stats.hi_score, stats.level,
+            stats.ships_left),
+        DYNAMIC.pack(settings.ship_speed, settings.bullet_speed, settings.fleet_speed,
+            settings.fleet_drop_speed, settings.starting_ship_count, settings.bullet_w,
+            settings.bullet_h, settings.bullet_amount, settings.alien_points,
+            settings.alien_fire_rate, settings.alien_bullet_speed),
+        _pack_floats(positions),
+        _pack_floats(bullets),
+        _pack_floats(shots),
+        ))
+
+
+def restore(game: 'AlienInvasion', data):
+    settings = game.settings
+    (magic, version, backend, screen_w, screen_h, alien_count, bullet_count,
+        shot_count) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'not a version {VERSION} snapshot')
+    if (BACKENDS[backend], screen_w, screen_h) != (settings.fleet_backend,
+            settings.screen_w, settings.screen_h):
+        raise ValueError('snapshot was taken with a different fleet backend or screen size')
+    offset = HEADER.size
+
+    state, timer, game.accumulator, game.auto_fire_timer = GAME.unpack_from(data, offset)
+    offset += GAME.size
+    ship_x, prev_x, moving_right, moving_left = SHIP.unpack_from(data, offset)
+    offset += SHIP.size
+    direction, drop_speed, offset_x, offset_y, prev_dx, prev_dy = \
+        FLEET.unpack_from(data, offset)
+    offset += FLEET.size
+    fire_timer, fired = FIRE.unpack_from(data, offset)
+    offset += FIRE.size
+    stats = game.game_stats
+    (stats.score, stats.max_score, hi_score, stats.level,
+        stats.ships_left) = STATS.unpack_from(data, offset)
+    offset += STATS.size
+    (settings.ship_speed, settings.bullet_speed, settings.fleet_speed,
+        settings.fleet_drop_speed, settings.starting_ship_count, settings.bullet_w,
+        settings.bullet_h, settings.bullet_amount, settings.alien_points,
+        settings.alien_fire_rate, settings.alien_bullet_speed) = \
+        DYNAMIC.unpack_from(data, offset)
+    offset += DYNAMIC.size
+    positions, offset = _unpack_floats(data, offset, alien_count * 2)
+    bullets, offset = _unpack_floats(data, offset, bullet_count * 3)
+    shots, offset = _unpack_floats(data, offset, shot_count * 3)
+
+    # a fork never lowers the hi-score it inherits
+    stats.hi_score = max(stats.hi_score, hi_score)
+    game.state.current = STATES[state]
+    game.state.timer = timer
+
+    ship = game.ship
+    ship.x = ship_x
+    ship.rect.x = ship_x
+    ship.prev_x = prev_x
+    ship.moving_right, ship.moving_left = moving_right, moving_left
+
+    game.assets.sync(settings)
+    arsenal = ship.arsenal
+    arsenal.reset()
+    if arsenal.capacity != settings.bullet_amount:
+        arsenal._resize_pool()
+    for i in range(0, len(bullets), 3):
+        bullet = arsenal.pool.pop() if arsenal.pool else Bullet(arsenal)
+        bullet.rect.x = bullets[i]
+        bullet.y = bullets[i + 1]
+        bullet.rect.y = bullet.y
+        bullet.prev_y = bullets[i + 2]
+        arsenal.arsenal.add(bullet)
+
+    fleet = game.alien_fleet
+    fleet.fleet_direction = direction
+    fleet.fleet_drop_speed = drop_speed
+    fleet.restore_positions(positions, offset_x, offset_y, (prev_dx, prev_dy))
+    fire = fleet.arsenal
+    if fire is not None:
+        shots = np.array(shots).reshape(-1, 3)[:len(fire.x)]
+        n = fire.count = len(shots)
+        fire.x[:n], fire.y[:n], fire.prev_y[:n] = shots[:, 0], shots[:, 1], shots[:, 2]
+        fire.timer, fire.shots = fire_timer, fired
+
+    game.HUD.update_scores()
+    game.HUD.update_level()
+    game.renderer.invalidate()
+    if game.state.active and not settings.headless:
+        # headless games never draw, so they never wait on the preloader
+        game._wait_for_assets()
+    pygame.mouse.set_visible(not game.state.active)
+
+
+def fork(game: 'AlienInvasion', count, headless=True):
+    # independent games that continue from the current frame
+    data = snapshot(game)
+    games = []
+    for _ in range(count):
+        settings = copy.deepcopy(game.settings)
+        settings.headless = settings.headless or headless
+        forked = AlienInvasion(settings, parent=game)
+        restore(forked, data)
+        games.append(forked)
+    return games
+
+
+def save(game: 'AlienInvasion', path):
+    Path(path).write_bytes(snapshot(game))
+
+
+def load(game: 'AlienInvasion', path):
+    restore(game, Path(path).read_bytes())
@@ -0,0 +1,76 @@
+class SpatialHash:
+
+    def __init__(self, cell_w: int, cell_h: int):
+        self.cell_w = max(1, int(cell_w))
+        self.cell_h = max(1, int(cell_h))
+        self.cells = {}
+        self.order = {}
+        self._footprints = {}
+        self._next_order = 0
+
+    def _footprint(self, rect):
+        return (rect.left // self.cell_w, rect.top // self.cell_h,
+                (rect.right - 1) // self.cell_w, (rect.bottom - 1) // self.cell_h)
+
+    def _cells(self, footprint):
+        left, top, right, bottom = footprint
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                yield (cx, cy)
+
+    def insert(self, sprite):
+        footprint = self._footprint(sprite.rect)
+        self._footprints[sprite] = footprint
+        self.order[sprite] = self._next_order
+        self._next_order += 1
+        for key in self._cells(footprint):
+            self.cells.setdefault(key, set()).add(sprite)
+
+    def remove(self, sprite):
+        footprint = self._footprints.pop(sprite, None)
+        if footprint is None:
+            return
+        del self.order[sprite]
+        for key in self._cells(footprint):
+            cell = self.cells[key]
+            cell.discard(sprite)
+            if not cell:
+                del self.cells[key]
+
+    def update(self, sprite):
+        # only touch the buckets when the sprite crossed a cell boundary
+        footprint = self._footprint(sprite.rect)
+        old = self._footprints[sprite]
+        if footprint == old:
+            return
+        self._footprints[sprite] = footprint
+        for key in self._cells(old):
+            cell = self.cells[key]
+            cell.discard(sprite)
+            if not cell:
+                del self.cells[key]
+        for key in self._cells(footprint):
+            self.cells.setdefault(key, set()).add(sprite)
+
+    def update_all(self, sprites):
+        update = self.update
+        for sprite in sprites:
+            update(sprite)
+
+    def query(self, rect):
+        found = set()
+        cells = self.cells
+        for key in self._cells(self._footprint(rect)):
+            cell = cells.get(key)
+            if cell:
+                found.update(cell)
+        return [sprite for sprite in found if sprite.rect.colliderect(rect)]
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+        self._footprints.clear()
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._footprints)